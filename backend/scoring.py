@@ -0,0 +1,159 @@
+# Scoring rules for the website analyzer, as plain functions over primitive inputs.
+# Kept out of server.py so this module can be compiled with mypyc (`mypyc scoring.py`);
+# the pure-Python module is used as is when no compiled build is present.
+from typing import Any, Dict, List
+
+def score_performance(response_time: float, content_size: int, images_total: int, images_without_alt: int) -> Dict[str, Any]:
+    """Score response time, page size and image optimization"""
+    performance_score = 100
+    issues: List[str] = []
+    
+    # Response time analysis
+    if response_time > 3.0:
+        performance_score -= 30
+        issues.append("Slow response time (>3 seconds)")
+    elif response_time > 1.5:
+        performance_score -= 15
+        issues.append("Moderate response time (>1.5 seconds)")
+    
+    # Content size analysis
+    if content_size > 1000000:  # 1MB
+        performance_score -= 20
+        issues.append("Large page size (>1MB)")
+    elif content_size > 500000:  # 500KB
+        performance_score -= 10
+        issues.append("Moderate page size (>500KB)")
+    
+    # Image optimization
+    if images_without_alt > 0:
+        performance_score -= min(images_without_alt * 2, 20)
+        issues.append(f"{images_without_alt} images missing alt text")
+    
+    return {
+        'score': max(performance_score, 0),
+        'response_time': response_time,
+        'content_size': content_size,
+        'images_count': images_total,
+        'images_without_alt': images_without_alt,
+        'issues': issues
+    }
+
+def score_seo(title: str, meta_description: str, h1_count: int, word_count: int, internal_links: int, external_links: int) -> Dict[str, Any]:
+    """Score title, meta description, headings, content length and linking"""
+    seo_score = 100
+    issues: List[str] = []
+    
+    # Title analysis
+    if not title:
+        seo_score -= 20
+        issues.append("Missing page title")
+    elif len(title) > 60:
+        seo_score -= 10
+        issues.append("Title too long (>60 characters)")
+    elif len(title) < 30:
+        seo_score -= 5
+        issues.append("Title too short (<30 characters)")
+    
+    # Meta description analysis
+    if not meta_description:
+        seo_score -= 15
+        issues.append("Missing meta description")
+    elif len(meta_description) > 160:
+        seo_score -= 8
+        issues.append("Meta description too long (>160 characters)")
+    elif len(meta_description) < 120:
+        seo_score -= 5
+        issues.append("Meta description too short (<120 characters)")
+    
+    # Heading structure analysis
+    if h1_count == 0:
+        seo_score -= 15
+        issues.append("Missing H1 tag")
+    elif h1_count > 1:
+        seo_score -= 10
+        issues.append("Multiple H1 tags found")
+    
+    # Content analysis
+    if word_count < 300:
+        seo_score -= 15
+        issues.append("Low word count (<300 words)")
+    
+    # Internal vs external links
+    if internal_links == 0:
+        seo_score -= 10
+        issues.append("No internal links found")
+    
+    return {
+        'score': max(seo_score, 0),
+        'title_length': len(title),
+        'meta_description_length': len(meta_description),
+        'word_count': word_count,
+        'h1_count': h1_count,
+        'internal_links': internal_links,
+        'external_links': external_links,
+        'issues': issues
+    }
+
+def score_technical_health(https_enabled: bool, has_viewport: bool, has_meta_description: bool) -> Dict[str, Any]:
+    """Score HTTPS usage and the presence of essential meta tags"""
+    technical_score = 100
+    issues: List[str] = []
+    
+    # HTTPS check
+    if not https_enabled:
+        technical_score -= 20
+        issues.append("Website not using HTTPS")
+    
+    # Meta viewport check
+    if not has_viewport:
+        technical_score -= 15
+        issues.append("Missing viewport meta tag")
+    
+    # Structured data check (basic)
+    if not has_meta_description:
+        technical_score -= 10
+        issues.append("Missing meta description")
+    
+    return {
+        'score': max(technical_score, 0),
+        'https_enabled': https_enabled,
+        'has_viewport': has_viewport,
+        'issues': issues
+    }
+
+def score_accessibility(images_total: int, images_without_alt: int, h1_count: int) -> Dict[str, Any]:
+    """Score image alt text coverage and heading structure"""
+    accessibility_score = 100
+    issues: List[str] = []
+    alt_percentage = 100.0
+    
+    # Image alt text analysis
+    if images_total > 0:
+        alt_percentage = ((images_total - images_without_alt) / images_total) * 100
+        if alt_percentage < 80:
+            accessibility_score -= 25
+            issues.append(f"Only {alt_percentage:.0f}% of images have alt text")
+        elif alt_percentage < 90:
+            accessibility_score -= 15
+            issues.append(f"{alt_percentage:.0f}% of images have alt text (should be 100%)")
+    
+    # Heading structure
+    if h1_count == 0:
+        accessibility_score -= 15
+        issues.append("Missing H1 heading for screen readers")
+    
+    return {
+        'score': max(accessibility_score, 0),
+        'images_with_alt_percentage': alt_percentage if images_total > 0 else 100,
+        'issues': issues
+    }
+
+def overall_score(performance_score: int, seo_score: int, technical_score: int, accessibility_score: int, schema_faq_score: int) -> int:
+    """Weighted overall score (adjusted for the schema/FAQ component)"""
+    return int(
+        (performance_score * 0.25) +
+        (seo_score * 0.35) +
+        (technical_score * 0.15) +
+        (accessibility_score * 0.10) +
+        (schema_faq_score * 0.15)
+    )
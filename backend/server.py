@@ -1,44 +1,72 @@
-from fastapi import FastAPI, APIRouter, HTTPException, BackgroundTasks
+from fastapi import FastAPI, APIRouter, HTTPException, Request
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.middleware.gzip import GZipMiddleware
+from pymongo import AsyncMongoClient, WriteConcern
+from pymongo.errors import BulkWriteError
+import redis.asyncio as aioredis
 import os
 import logging
+import multiprocessing
 from pathlib import Path
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 from typing import List, Dict, Any, Optional
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+import hashlib
+import itertools
+from bisect import bisect_right
 import aiohttp
 import asyncio
-import json
+import orjson
+import msgspec
 import re
 from urllib.parse import urljoin, urlparse
 import time
-from bs4 import BeautifulSoup
-import requests
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+from cachetools import TTLCache
 from emergentintegrations.llm.chat import LlmChat, UserMessage
-import json
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.units import inch
+from scoring import score_performance, score_seo, score_technical_health, score_accessibility, overall_score
 from io import BytesIO
-import base64
-from fastapi.responses import StreamingResponse
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# Datetimes come back timezone-aware, matching the UTC timestamps the models create
+client = AsyncMongoClient(mongo_url, tz_aware=True)
 db = client[os.environ['DB_NAME']]
+# Legacy status checks are not critical, so their inserts skip waiting for the server acknowledgement
+status_checks_collection = db.get_collection('status_checks', write_concern=WriteConcern(w=0))
+# Parsed page content is only read on demand from the content endpoint, so its inserts don't wait either.
+# Analyses stay acknowledged, as completion is only reported once the result can be read back
+analysis_blobs_collection = db.get_collection('analysis_blobs', write_concern=WriteConcern(w=0))
+
+# Optional Redis connection, used to share progress between workers
+redis_url = os.environ.get('REDIS_URL')
+redis_client = aioredis.from_url(redis_url, decode_responses=True) if redis_url else None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up shared connections before serving requests and close them on shutdown"""
+    await client.admin.command('ping')
+    if redis_client:
+        await redis_client.ping()
+    await create_indexes()
+    await analyzer.startup()
+    yield
+    await analyzer.shutdown()
+    await client.close()
+    if redis_client:
+        await redis_client.aclose()
 
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -50,6 +78,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def utc_now():
+    """Return the current time as a timezone-aware UTC datetime"""
+    return datetime.now(timezone.utc)
+
 # Models
 class AnalysisRequest(BaseModel):
     url: str
@@ -62,6 +94,8 @@ class AnalysisProgress(BaseModel):
     message: str
 
 class AnalysisResult(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     session_id: str
     url: str
@@ -75,34 +109,452 @@ class AnalysisResult(BaseModel):
     ai_insights: Dict[str, Any]
     schema_faq_analysis: Dict[str, Any]
     checkpoint_category: str
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    content_hash: Optional[str] = None
+    parsed_content_id: Optional[str] = None
+    created_at: datetime = Field(default_factory=utc_now)
     completed_at: Optional[datetime] = None
 
 class StatusCheck(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     client_name: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=utc_now)
 
 class StatusCheckCreate(BaseModel):
     client_name: str
 
-# In-memory progress tracking
-analysis_progress = {}
+# Lightweight response record for listing stored status checks, encoded with msgspec
+class StatusCheckRecord(msgspec.Struct):
+    id: str
+    client_name: str
+    timestamp: datetime
+
+status_check_encoder = msgspec.json.Encoder()
+STATUS_CHECK_PROJECTION = {"_id": 0, "id": 1, "client_name": 1, "timestamp": 1}
+
+# Identical page content analyzed within this window reuses the stored result
+ANALYSIS_CACHE_TTL = int(os.environ.get('ANALYSIS_CACHE_TTL', '3600'))
+
+# Fields returned for the recent analyses list, which never needs the full analysis data
+RECENT_ANALYSES_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "session_id": 1,
+    "url": 1,
+    "overall_score": 1,
+    "checkpoint_category": 1,
+    "schema_faq_analysis.category_label": 1,
+    "created_at": 1
+}
+
+# Redis caching of API responses; completed results never change, so they are written
+# to the cache as soon as an analysis finishes and read through it otherwise
+RESULT_CACHE_TTL = 86400
+# Without Redis, encoded results are kept in a bounded in-process cache instead
+RESULT_CACHE_SIZE = 1024
+result_payloads = TTLCache(maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+RECENT_ANALYSES_CACHE_TTL = 10
+RECENT_ANALYSES_CACHE_KEY = "analyses:recent"
+# Result lookups in flight, shared by concurrent requests for the same session
+inflight_results = {}
+
+# Completed analyses are written in batches of up to this many documents or this many seconds
+ANALYSIS_WRITE_BATCH_SIZE = 64
+ANALYSIS_WRITE_BATCH_WINDOW = 0.05
+
+# Bulky parsed page content, stored in analysis_blobs instead of the analyses collection
+PARSED_CONTENT_BLOB_FIELDS = ('text_content', 'links', 'images')
+# Only counts of links and images feed the scores, so just the first few are kept as a sample
+PARSED_SAMPLE_SIZE = 50
+
+# Pool processes are started from a clean server process rather than forked from this multi-threaded one,
+# where a lock held by another thread at fork time could deadlock the child
+PROCESS_POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Analyses are run by this many worker tasks; at most ANALYSIS_QUEUE_SIZE more can wait for one
+ANALYSIS_CONCURRENCY = int(os.environ.get('ANALYSIS_CONCURRENCY', '8'))
+ANALYSIS_QUEUE_SIZE = int(os.environ.get('ANALYSIS_QUEUE_SIZE', '1000'))
+ANALYSIS_QUEUE_FULL_MESSAGE = "Too many analyses in progress, please try again later"
+
+# Pages are streamed in chunks and rejected once they grow past this size
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', str(5 * 1024 * 1024)))
+FETCH_CHUNK_SIZE = 64 * 1024
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+# Pages served without a charset are checked for a <meta charset> within their first bytes
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+META_CHARSET_SCAN_SIZE = 4096
+
+# Progress tracking: kept in Redis when REDIS_URL is set, otherwise in a bounded in-process cache
+PROGRESS_TTL = 3600
+PROGRESS_CACHE_SIZE = 10000
+analysis_progress = TTLCache(maxsize=PROGRESS_CACHE_SIZE, ttl=PROGRESS_TTL)
+PROGRESS_TERMINAL_STATUSES = ('completed', 'error')
+# Redis writes for a session are coalesced so updates arriving within this window cost one round-trip
+PROGRESS_BATCH_WINDOW = 0.05
+pending_progress = {}
+progress_flushers = {}
+# In-process streams each wait on their own event, registered per session and set when its progress changes
+progress_events = {}
+# Idle in-process streams send a heartbeat comment this often, and end if their session has expired
+PROGRESS_STREAM_HEARTBEAT = 15
+
+# AI recommendations keyed by a hash of the analysis summary sent to the model
+AI_INSIGHTS_CACHE_SIZE = 1024
+AI_INSIGHTS_CACHE_TTL = 3600
+ai_insights_cache = TTLCache(maxsize=AI_INSIGHTS_CACHE_SIZE, ttl=AI_INSIGHTS_CACHE_TTL)
+
+def progress_key(session_id: str):
+    return f"progress:{session_id}"
+
+def result_cache_key(session_id: str):
+    return f"analysis:{session_id}"
+
+async def cache_result_payload(session_id: str, payload: bytes):
+    """Keep the encoded result of a session so later reads can return it without touching Mongo"""
+    if redis_client:
+        await redis_client.set(result_cache_key(session_id), payload, ex=RESULT_CACHE_TTL)
+    else:
+        result_payloads[session_id] = payload
+
+async def save_progress(session_id: str, progress_data: dict, immediate: bool = False):
+    """Store the progress of a session and notify stream subscribers; immediate writes skip the Redis batching"""
+    if redis_client and immediate:
+        await write_progress(session_id, progress_data)
+    elif redis_client:
+        pending_progress[session_id] = progress_data
+        if session_id not in progress_flushers:
+            progress_flushers[session_id] = asyncio.create_task(flush_progress(session_id))
+    else:
+        analysis_progress[session_id] = progress_data
+        # Wake the in-process streams waiting for this session's next update
+        for progress_event in progress_events.get(session_id, ()):
+            progress_event.set()
+
+async def flush_progress(session_id: str):
+    """Write the latest buffered progress of a session to Redis, at most once per batch window"""
+    try:
+        while session_id in pending_progress:
+            await write_progress(session_id, pending_progress.pop(session_id))
+            await asyncio.sleep(PROGRESS_BATCH_WINDOW)
+    except Exception as e:
+        logger.error(f"Failed to store progress for {session_id}: {str(e)}")
+    finally:
+        progress_flushers.pop(session_id, None)
+
+async def write_progress(session_id: str, progress_data: dict):
+    """Write the progress of a session to Redis and publish it to stream subscribers"""
+    # Progress is a Redis hash, updated and expired atomically in one transaction
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(progress_key(session_id), mapping=progress_data)
+        pipe.expire(progress_key(session_id), PROGRESS_TTL)
+        pipe.publish(progress_key(session_id), orjson.dumps(progress_data))
+        await pipe.execute()
+
+async def load_progress(session_id: str):
+    """Return the progress of a session, or None if it is unknown"""
+    if redis_client:
+        progress_data = await redis_client.hgetall(progress_key(session_id))
+        if not progress_data:
+            return None
+        progress_data['progress'] = int(progress_data['progress'])
+        return progress_data
+    return analysis_progress.get(session_id)
+
+async def stream_progress(session_id: str):
+    """Yield progress updates for a session as server-sent events until it finishes"""
+    if redis_client:
+        pubsub = redis_client.pubsub()
+        # Subscribe before reading the current state so no update falls in between
+        await pubsub.subscribe(progress_key(session_id))
+        try:
+            progress_data = await load_progress(session_id)
+            if progress_data:
+                yield f"data: {orjson.dumps(progress_data).decode()}\n\n"
+                if progress_data['status'] in PROGRESS_TERMINAL_STATUSES:
+                    return
+            async for message in pubsub.listen():
+                if message['type'] != 'message':
+                    continue
+                yield f"data: {message['data']}\n\n"
+                if orjson.loads(message['data'])['status'] in PROGRESS_TERMINAL_STATUSES:
+                    return
+        finally:
+            await pubsub.unsubscribe(progress_key(session_id))
+            await pubsub.aclose()
+    else:
+        last_progress = None
+        progress_event = asyncio.Event()
+        progress_events.setdefault(session_id, set()).add(progress_event)
+        try:
+            while True:
+                progress_data = analysis_progress.get(session_id)
+                if progress_data is None:
+                    # The session expired before finishing, so no further update will arrive
+                    return
+                if progress_data != last_progress:
+                    yield f"data: {orjson.dumps(progress_data).decode()}\n\n"
+                    last_progress = progress_data
+                    if progress_data['status'] in PROGRESS_TERMINAL_STATUSES:
+                        return
+                try:
+                    await asyncio.wait_for(progress_event.wait(), PROGRESS_STREAM_HEARTBEAT)
+                    progress_event.clear()
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+        finally:
+            session_events = progress_events.get(session_id)
+            if session_events is not None:
+                session_events.discard(progress_event)
+                if not session_events:
+                    del progress_events[session_id]
+
+# HTML helpers
+# Text inside these elements is code, not page content
+NON_CONTENT_TAGS = ('script', 'style')
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+# FAQ detection patterns, compiled once at import
+FAQ_TEXT_PATTERNS = (
+    r'frequently asked questions?',
+    r'f\.?a\.?q\.?s?',
+    r'common questions?',
+    r'questions? (?:and|&) answers?',
+    r'q\s*&\s*a',
+    r'help (?:and|&) support'
+)
+FAQ_TEXT_PATTERN_RES = [re.compile(pattern) for pattern in FAQ_TEXT_PATTERNS]
+# Combined pattern, used as a single cheap scan to skip the per-pattern scans on pages without any match
+FAQ_TEXT_RE = re.compile('|'.join(FAQ_TEXT_PATTERNS))
+FAQ_HEADING_PATTERNS = [re.compile(pattern) for pattern in (
+    r'faq',
+    r'frequently asked',
+    r'common questions',
+    r'questions?.*answers?',
+    r'help.*support'
+)]
+FAQ_HEADING_RE = re.compile('|'.join(pattern_re.pattern for pattern_re in FAQ_HEADING_PATTERNS))
+# Q&A markers are matched at the start of a text node; with one node per line (and line breaks
+# inside nodes flattened to spaces) the whole page text can be scanned at once
+FAQ_QUESTION_RE = re.compile(r'^[^\S\n]*(?:Q\d*[:.]?|Question\d*[:.]?|\?)', re.IGNORECASE | re.MULTILINE)
+FAQ_ANSWER_RE = re.compile(r'^[^\S\n]*(?:A\d*[:.]?|Answer\d*[:.]?)', re.IGNORECASE | re.MULTILINE)
+# Elements whose class mentions FAQ content, matched case-insensitively by the parser itself
+FAQ_CLASS_SELECTOR = ':is([class*="faq" i], [class*="question" i], [class*="accordion" i])'
+# Schema.org item types that mark FAQ content
+FAQ_ITEMTYPE_MARKERS = ('faqpage', 'question')
+
+# JSON-LD blocks, matched straight from the raw HTML without building a tree
+JSON_LD_RE = re.compile(r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+# JSON-LD without this key declares no schema type, so it is not worth decoding
+JSON_LD_TYPE_KEY = '"@type"'
+
+# AI insight prompts; only the analysis summary appended to the request varies per call
+AI_SYSTEM_MESSAGE = "You are an expert SEO and web performance consultant. Analyze the provided website data and provide specific, actionable recommendations for improvement."
+AI_RECOMMENDATIONS_PROMPT = "Analyze this website data and provide 5 specific, actionable recommendations to improve SEO and performance. Format as JSON with 'recommendations' array containing objects with 'title', 'description', 'priority' (High/Medium/Low), and 'impact' fields. Respond with the JSON object only, without markdown or commentary:\n\n"
+# The AI summary leaves out categories scoring at least this much and lists at most this many issues per category
+AI_SUMMARY_SCORE_CUTOFF = 80
+AI_SUMMARY_MAX_ISSUES = 5
+# AI responses larger than this are decoded in a worker thread
+AI_INLINE_DECODE_LIMIT = 64 * 1024
+
+def iter_text_nodes(tree: LexborHTMLParser):
+    """Yield the text nodes of the document that hold visible page content"""
+    for node in tree.root.traverse(include_text=True):
+        if node.tag == '-text' and node.parent is not None and node.parent.tag not in NON_CONTENT_TAGS:
+            yield node
+
+def class_list(node: LexborNode):
+    """Return the class attribute of a node as a list of class names"""
+    return (node.attributes.get('class') or '').split()
+
+def fast_detect_json_ld(html_content: str):
+    """Return the JSON-LD schema types declared in raw HTML, skipping the full parse"""
+    schema_types = []
+    for match in JSON_LD_RE.finditer(html_content):
+        script_text = match.group(1)
+        if JSON_LD_TYPE_KEY not in script_text:
+            continue
+        try:
+            schema_data = orjson.loads(script_text)
+        except orjson.JSONDecodeError:
+            continue
+        items = schema_data if isinstance(schema_data, list) else [schema_data]
+        schema_types.extend(item['@type'] for item in items if isinstance(item, dict) and '@type' in item)
+    return schema_types
+
+def is_faq_itemtype(itemtype: str):
+    """Check whether a microdata itemtype describes FAQ content"""
+    itemtype = itemtype.lower()
+    return any(marker in itemtype for marker in FAQ_ITEMTYPE_MARKERS)
+
+def truncate_preview(text: str, length: int = 50):
+    """Return text truncated to a short preview"""
+    return text[:length] + '...' if len(text) > length else text
+
+def text_preview(node: LexborNode, length: int = 50):
+    """Return the text of a node truncated to a short preview"""
+    return truncate_preview(node.text(), length)
+
+def format_size(size: float):
+    """Format a byte count as a short human-readable size"""
+    for unit in ('bytes', 'KB'):
+        if size < 1024:
+            return f"{round(size, 1):g} {unit}"
+        size /= 1024
+    return f"{round(size, 1):g} MB"
+
+def decode_html(body: bytes, declared_charset: Optional[str]):
+    """Decode a page with the charset from its headers or <meta> tag, else as UTF-8 falling back to cp1252"""
+    meta_charset = META_CHARSET_RE.search(body, 0, META_CHARSET_SCAN_SIZE)
+    for encoding in (declared_charset, meta_charset and meta_charset.group(1).decode('ascii')):
+        if encoding:
+            try:
+                return body.decode(encoding, errors='replace')
+            except LookupError:
+                # Unknown charset declared by the page
+                continue
+    try:
+        return body.decode('utf-8')
+    except UnicodeDecodeError:
+        # Legacy pages without a declared charset are most often Windows-1252
+        return body.decode('cp1252', errors='replace')
+
+# PDF report styles
+# Score status labels, looked up by the first cutoff above the score
+SCORE_STATUS_CUTOFFS = (40, 60, 80)
+SCORE_STATUS_LABELS = ("Poor", "Fair", "Good", "Excellent")
+
+@lru_cache(maxsize=1)
+def load_pdf_styles():
+    """Build the PDF report stylesheet once, on the first export, and reuse it for every report"""
+    # ReportLab is only needed for exports, so keep it out of worker startup
+    from reportlab import rl_config
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    
+    # Skip ReportLab's per-attribute validation of drawing shapes
+    rl_config.shapeChecking = 0
+    
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=30,
+        textColor=colors.HexColor('#1e40af'),
+        alignment=1  # Center alignment
+    ))
+    styles.add(ParagraphStyle(
+        'URLStyle',
+        parent=styles['Normal'],
+        fontSize=14,
+        spaceAfter=20,
+        alignment=1
+    ))
+    styles.add(ParagraphStyle(
+        'ScoreStyle',
+        parent=styles['Heading2'],
+        fontSize=18,
+        spaceAfter=15,
+        textColor=colors.HexColor('#059669')
+    ))
+    return styles
+
+@lru_cache(maxsize=1)
+def load_scores_table_style():
+    """Build the style of the report's scores table once and share it between reports"""
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+    
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e5e7eb')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
 
 # Analysis Engine
 class WebsiteAnalyzer:
     def __init__(self):
         self.openai_api_key = os.environ.get('OPENAI_API_KEY')
+        self.http_session = None
+        self.write_queue = None
+        self.write_task = None
+        self.process_pool = None
+        self.analysis_queue = None
+        self.analysis_workers = []
+        # Analyses run concurrently on the worker tasks, so their LLM calls overlap; this caps how many are in flight
+        self.ai_semaphore = asyncio.Semaphore(int(os.environ.get('AI_MAX_CONCURRENCY', '8')))
+    
+    async def startup(self):
+        """Open the HTTP session shared by all website fetches, start the batched result writer, the parsing pool and the analysis workers"""
+        self.process_pool = ProcessPoolExecutor(
+            max_workers=int(os.environ.get('ANALYSIS_WORKERS', str(os.cpu_count() or 1))),
+            mp_context=multiprocessing.get_context(PROCESS_POOL_START_METHOD)
+        )
+        self.analysis_queue = asyncio.Queue(maxsize=ANALYSIS_QUEUE_SIZE)
+        self.analysis_workers = [asyncio.create_task(self.run_analysis_worker()) for _ in range(ANALYSIS_CONCURRENCY)]
+        self.write_queue = asyncio.Queue()
+        self.write_task = asyncio.create_task(self.flush_analysis_writes())
+        self.http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=30),
+            connector=aiohttp.TCPConnector(
+                limit=int(os.environ.get('FETCH_CONNECTION_LIMIT', '200')),
+                limit_per_host=int(os.environ.get('FETCH_CONNECTION_LIMIT_PER_HOST', '75')),
+                ttl_dns_cache=600,
+                keepalive_timeout=60
+            )
+        )
+    
+    async def shutdown(self):
+        """Stop the analysis workers, close the shared HTTP session, stop the result writer once pending writes are flushed and stop the parsing pool"""
+        for worker in self.analysis_workers:
+            worker.cancel()
+        await asyncio.gather(*self.analysis_workers, return_exceptions=True)
+        
+        # Analyses still waiting for a worker will never run, so end their sessions too
+        while self.analysis_queue and not self.analysis_queue.empty():
+            _, session_id = self.analysis_queue.get_nowait()
+            await self.update_progress(session_id, 0, "error", "Analysis cancelled: the server is shutting down")
+        
+        # Let buffered progress updates reach Redis before its connection is closed
+        await asyncio.gather(*progress_flushers.values(), return_exceptions=True)
+        if self.http_session:
+            await self.http_session.close()
+        if self.write_task:
+            await self.write_queue.join()
+            self.write_task.cancel()
+        if self.process_pool:
+            self.process_pool.shutdown(cancel_futures=True)
+    
+    async def run_analysis_worker(self):
+        """Run queued analyses one at a time; a fixed number of these workers bounds concurrent analyses"""
+        while True:
+            url, session_id = await self.analysis_queue.get()
+            try:
+                await self.analyze_website(url, session_id)
+            except asyncio.CancelledError:
+                await self.update_progress(session_id, 0, "error", "Analysis cancelled: the server is shutting down")
+                raise
+            except Exception:
+                # analyze_website records its own failures; anything escaping it must not stop the worker
+                logger.exception(f"Analysis worker failed for {url}")
+            finally:
+                self.analysis_queue.task_done()
         
     async def analyze_website(self, url: str, session_id: str):
-        """Main analysis function"""
+        """Main analysis function; failures are recorded in the session progress instead of being raised"""
         try:
             # Initialize progress
-            analysis_progress[session_id] = {
+            await save_progress(session_id, {
                 "progress": 0,
                 "status": "starting",
                 "message": "Initializing analysis..."
-            }
+            })
             
             # Step 1: Fetch website content
             await self.update_progress(session_id, 10, "fetching", "Fetching website content...")
@@ -111,29 +563,22 @@ class WebsiteAnalyzer:
             if not html_content:
                 raise HTTPException(status_code=400, detail="Could not fetch website content")
             
-            # Step 2: Parse and extract data
-            await self.update_progress(session_id, 30, "parsing", "Parsing website structure...")
-            parsed_data = self.parse_html_content(html_content, url)
+            # Reuse a recent analysis of the same content instead of recomputing it
+            content_hash = hashlib.blake2b(html_content.encode(), digest_size=16).hexdigest()
+            cached_result = await self.find_cached_analysis(url, content_hash)
+            if cached_result:
+                result = AnalysisResult(session_id=session_id, completed_at=utc_now(), **cached_result)
+                await self.store_result(result)
+                await self.update_progress(session_id, 100, "completed", "Analysis completed!")
+                return result
             
-            # Step 3: Analyze performance
-            await self.update_progress(session_id, 50, "analyzing", "Analyzing performance metrics...")
-            performance_data = self.analyze_performance(parsed_data, response_time, len(html_content))
-            
-            # Step 4: Analyze SEO
-            await self.update_progress(session_id, 70, "analyzing", "Analyzing SEO factors...")
-            seo_data = self.analyze_seo(parsed_data)
-            
-            # Step 5: Technical health check
-            await self.update_progress(session_id, 80, "analyzing", "Checking technical health...")
-            technical_data = self.analyze_technical_health(parsed_data, url)
-            
-            # Step 6: Accessibility analysis
-            await self.update_progress(session_id, 85, "analyzing", "Analyzing accessibility...")
-            accessibility_data = self.analyze_accessibility(parsed_data)
-            
-            # Step 7: Schema and FAQ analysis
-            await self.update_progress(session_id, 90, "analyzing", "Analyzing schema and FAQ structure...")
-            schema_faq_data = self.analyze_schema_and_faq(parsed_data, html_content)
+            # Steps 2-7: Parse the page, then run the performance, SEO, technical health, accessibility
+            # and schema/FAQ analysis. This is all CPU-bound, so it runs in one hop to the process pool
+            await self.update_progress(session_id, 30, "analyzing", "Parsing and analyzing website structure, SEO, accessibility and schema markup...")
+            loop = asyncio.get_running_loop()
+            parsed_data, performance_data, seo_data, technical_data, accessibility_data, schema_faq_data = await loop.run_in_executor(
+                self.process_pool, parse_and_score, html_content, url, response_time
+            )
             
             # Step 8: Generate AI insights
             await self.update_progress(session_id, 95, "generating", "Generating AI insights...")
@@ -142,17 +587,20 @@ class WebsiteAnalyzer:
             # Step 9: Calculate scores
             scores = self.calculate_scores(performance_data, seo_data, technical_data, accessibility_data, schema_faq_data)
             
-            # Compile final result
+            # Compile final result, keeping only the parsed content summary in the analysis document
+            parsed_summary = {key: value for key, value in parsed_data.items() if key not in PARSED_CONTENT_BLOB_FIELDS}
             analysis_data = {
                 "performance": performance_data,
                 "seo": seo_data,
                 "technical": technical_data,
                 "accessibility": accessibility_data,
                 "schema_faq": schema_faq_data,
-                "parsed_content": parsed_data
+                "parsed_content": parsed_summary
             }
             
+            analysis_id = str(uuid.uuid4())
             result = AnalysisResult(
+                id=analysis_id,
                 session_id=session_id,
                 url=url,
                 overall_score=scores["overall"],
@@ -165,11 +613,17 @@ class WebsiteAnalyzer:
                 ai_insights=ai_insights,
                 schema_faq_analysis=schema_faq_data,
                 checkpoint_category=schema_faq_data["checkpoint_category"],
-                completed_at=datetime.utcnow()
+                content_hash=content_hash,
+                parsed_content_id=analysis_id,
+                completed_at=utc_now()
             )
             
             # Save to database
-            await db.analyses.insert_one(result.dict())
+            await analysis_blobs_collection.insert_one({
+                "_id": analysis_id,
+                "parsed_content": {field: parsed_data[field] for field in PARSED_CONTENT_BLOB_FIELDS}
+            })
+            await self.store_result(result)
             
             # Final progress update
             await self.update_progress(session_id, 100, "completed", "Analysis completed!")
@@ -178,20 +632,85 @@ class WebsiteAnalyzer:
             
         except Exception as e:
             logger.error(f"Analysis failed for {url}: {str(e)}")
-            analysis_progress[session_id] = {
+            await save_progress(session_id, {
                 "progress": 0,
                 "status": "error",
                 "message": f"Analysis failed: {str(e)}"
-            }
-            raise HTTPException(status_code=500, detail=str(e))
+            })
+            return None
     
     async def update_progress(self, session_id: str, progress: int, status: str, message: str):
-        analysis_progress[session_id] = {
+        await save_progress(session_id, {
             "progress": progress,
             "status": status,
             "message": message
-        }
-        await asyncio.sleep(0.1)  # Small delay for realistic progress
+        })
+    
+    async def store_result(self, result: AnalysisResult):
+        """Persist a finished analysis and warm the result cache so its first read skips Mongo"""
+        document = result.model_dump()
+        # Encode before saving, as the insert adds the ObjectId to the document
+        payload = orjson.dumps(document)
+        await self.save_analysis(document)
+        await cache_result_payload(result.session_id, payload)
+    
+    async def save_analysis(self, document: dict):
+        """Queue an analysis document for the batched writer and wait until it is stored"""
+        stored = asyncio.get_running_loop().create_future()
+        await self.write_queue.put((document, stored))
+        await stored
+    
+    async def flush_analysis_writes(self):
+        """Write queued analyses with one insert_many per batch"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.write_queue.get()]
+            deadline = loop.time() + ANALYSIS_WRITE_BATCH_WINDOW
+            while len(batch) < ANALYSIS_WRITE_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.write_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await db.analyses.insert_many([document for document, _ in batch], ordered=False)
+                for _, stored in batch:
+                    if not stored.done():
+                        stored.set_result(None)
+            except BulkWriteError as e:
+                # The insert is unordered, so every document without a write error was still stored
+                write_errors = {error['index']: error for error in e.details.get('writeErrors', [])}
+                logger.error(f"Failed to store {len(write_errors)} of {len(batch)} analyses: {str(e)}")
+                for index, (_, stored) in enumerate(batch):
+                    if stored.done():
+                        continue
+                    if index in write_errors:
+                        stored.set_exception(RuntimeError(write_errors[index].get('errmsg', 'Write failed')))
+                    else:
+                        stored.set_result(None)
+            except Exception as e:
+                logger.error(f"Failed to store {len(batch)} analyses: {str(e)}")
+                for _, stored in batch:
+                    if not stored.done():
+                        stored.set_exception(e)
+            finally:
+                for _ in batch:
+                    self.write_queue.task_done()
+    
+    async def find_cached_analysis(self, url: str, content_hash: str):
+        """Find a recent analysis of the same URL and content, without its per-session fields"""
+        return await db.analyses.find_one(
+            {
+                'url': url,
+                'content_hash': content_hash,
+                'created_at': {'$gt': utc_now() - timedelta(seconds=ANALYSIS_CACHE_TTL)}
+            },
+            {'_id': 0, 'id': 0, 'session_id': 0, 'created_at': 0, 'completed_at': 0},
+            sort=[('created_at', -1)]
+        )
     
     async def fetch_website(self, url: str):
         """Fetch website content with performance timing"""
@@ -201,249 +720,157 @@ class WebsiteAnalyzer:
             
             start_time = time.time()
             
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
-                async with session.get(url, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }) as response:
-                    html_content = await response.text()
-                    response_time = time.time() - start_time
-                    return html_content, response.status, response_time
-                    
+            async with self.http_session.get(url, headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            }) as response:
+                content_type = response.headers.get('Content-Type', '')
+                if content_type and not content_type.lower().startswith(HTML_CONTENT_TYPES):
+                    raise HTTPException(status_code=415, detail=f"Unsupported content type: {content_type}")
+                
+                # Stream the body so oversized pages are aborted before they are fully read
+                body = bytearray()
+                async for chunk in response.content.iter_chunked(FETCH_CHUNK_SIZE):
+                    body.extend(chunk)
+                    if len(body) > MAX_PAGE_SIZE:
+                        raise HTTPException(status_code=413, detail=f"Page exceeds the {format_size(MAX_PAGE_SIZE)} size limit")
+                
+                html_content = decode_html(body, response.charset)
+                response_time = time.time() - start_time
+                return html_content, response.status, response_time
+        
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Failed to fetch {url}: {str(e)}")
             return None, None, None
     
     def parse_html_content(self, html_content: str, url: str):
-        """Parse HTML and extract relevant data"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Extract meta information
-        title = soup.find('title')
-        title_text = title.get_text().strip() if title else ""
-        
-        meta_description = soup.find('meta', attrs={'name': 'description'})
-        meta_description_text = meta_description.get('content', '') if meta_description else ""
-        
-        # Extract headings
-        headings = {
-            'h1': [h.get_text().strip() for h in soup.find_all('h1')],
-            'h2': [h.get_text().strip() for h in soup.find_all('h2')],
-            'h3': [h.get_text().strip() for h in soup.find_all('h3')],
-            'h4': [h.get_text().strip() for h in soup.find_all('h4')],
-            'h5': [h.get_text().strip() for h in soup.find_all('h5')],
-            'h6': [h.get_text().strip() for h in soup.find_all('h6')]
-        }
-        
-        # Extract links
+        """Parse HTML and extract relevant data, returning the parsed tree alongside it"""
+        tree = LexborHTMLParser(html_content)
+        
+        # Drop subtrees no analysis reads before walking the document: stylesheets, and every
+        # script except JSON-LD, which schema detection still needs
+        tree.strip_tags(['style'])
+        for script in tree.css('script:not([type="application/ld+json"])'):
+            script.decompose()
+        
+        title_text = None
+        meta_description_text = None
+        headings = {level: [] for level in HEADING_TAGS}
         links = []
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            if href.startswith('http'):
-                links.append({'url': href, 'text': link.get_text().strip(), 'external': True})
-            elif href.startswith('/'):
-                full_url = urljoin(url, href)
-                links.append({'url': full_url, 'text': link.get_text().strip(), 'external': False})
-        
-        # Extract images
         images = []
-        for img in soup.find_all('img'):
-            img_data = {
-                'src': img.get('src', ''),
-                'alt': img.get('alt', ''),
-                'title': img.get('title', ''),
-                'has_alt': bool(img.get('alt'))
-            }
-            images.append(img_data)
+        meta_tags = {}
+        text_chunks = []
+        images_total = 0
+        images_without_alt = 0
+        internal_links = 0
+        external_links = 0
+        
+        # Walk the document once, dispatching every node into its bucket
+        for node in tree.root.traverse(include_text=True):
+            tag = node.tag
+            
+            if tag == '-text':
+                # Text content
+                if node.parent is not None and node.parent.tag not in NON_CONTENT_TAGS:
+                    text_chunks.append(node.text_content)
+            
+            elif tag in headings:
+                headings[tag].append(node.text().strip())
+            
+            elif tag == 'a':
+                # Links
+                href = node.attributes.get('href') or ''
+                if href.startswith('http'):
+                    if len(links) < PARSED_SAMPLE_SIZE:
+                        links.append({'url': href, 'text': node.text().strip(), 'external': True})
+                    external_links += 1
+                elif href.startswith('/'):
+                    if len(links) < PARSED_SAMPLE_SIZE:
+                        links.append({'url': urljoin(url, href), 'text': node.text().strip(), 'external': False})
+                    internal_links += 1
+            
+            elif tag == 'img':
+                # Images
+                attrs = node.attributes
+                has_alt = bool(attrs.get('alt'))
+                if images_total < PARSED_SAMPLE_SIZE:
+                    images.append({
+                        'src': attrs.get('src') or '',
+                        'alt': attrs.get('alt') or '',
+                        'title': attrs.get('title') or '',
+                        'has_alt': has_alt
+                    })
+                images_total += 1
+                if not has_alt:
+                    images_without_alt += 1
+            
+            elif tag == 'meta':
+                # Meta tags, including the first meta description
+                attrs = node.attributes
+                name = attrs.get('name') or attrs.get('property') or attrs.get('http-equiv')
+                content = attrs.get('content')
+                if name and content:
+                    meta_tags[name] = content
+                if meta_description_text is None and attrs.get('name') == 'description':
+                    meta_description_text = content or ''
+            
+            elif tag == 'title' and title_text is None:
+                title_text = node.text().strip()
         
-        # Extract text content
-        text_content = soup.get_text()
+        text_content = ''.join(text_chunks)
         word_count = len(text_content.split())
         
-        # Extract meta tags
-        meta_tags = {}
-        for meta in soup.find_all('meta'):
-            name = meta.get('name') or meta.get('property') or meta.get('http-equiv')
-            content = meta.get('content')
-            if name and content:
-                meta_tags[name] = content
-        
-        return {
-            'title': title_text,
-            'meta_description': meta_description_text,
+        parsed_data = {
+            'title': title_text or "",
+            'meta_description': meta_description_text or "",
             'headings': headings,
             'links': links,
             'images': images,
+            'images_total': images_total,
+            'images_without_alt': images_without_alt,
+            'internal_links': internal_links,
+            'external_links': external_links,
             'text_content': text_content,
             'word_count': word_count,
             'meta_tags': meta_tags,
             'html_length': len(html_content)
         }
+        
+        return parsed_data, tree
     
     def analyze_performance(self, parsed_data: dict, response_time: float, content_size: int):
         """Analyze performance metrics"""
-        performance_score = 100
-        issues = []
-        
-        # Response time analysis
-        if response_time > 3.0:
-            performance_score -= 30
-            issues.append("Slow response time (>3 seconds)")
-        elif response_time > 1.5:
-            performance_score -= 15
-            issues.append("Moderate response time (>1.5 seconds)")
-        
-        # Content size analysis
-        if content_size > 1000000:  # 1MB
-            performance_score -= 20
-            issues.append("Large page size (>1MB)")
-        elif content_size > 500000:  # 500KB
-            performance_score -= 10
-            issues.append("Moderate page size (>500KB)")
-        
-        # Image optimization
-        images_without_alt = len([img for img in parsed_data['images'] if not img['has_alt']])
-        if images_without_alt > 0:
-            performance_score -= min(images_without_alt * 2, 20)
-            issues.append(f"{images_without_alt} images missing alt text")
-        
-        return {
-            'score': max(performance_score, 0),
-            'response_time': response_time,
-            'content_size': content_size,
-            'images_count': len(parsed_data['images']),
-            'images_without_alt': images_without_alt,
-            'issues': issues
-        }
+        return score_performance(response_time, content_size, parsed_data['images_total'], parsed_data['images_without_alt'])
     
     def analyze_seo(self, parsed_data: dict):
         """Analyze SEO factors"""
-        seo_score = 100
-        issues = []
-        
-        # Title analysis
-        title = parsed_data['title']
-        if not title:
-            seo_score -= 20
-            issues.append("Missing page title")
-        elif len(title) > 60:
-            seo_score -= 10
-            issues.append("Title too long (>60 characters)")
-        elif len(title) < 30:
-            seo_score -= 5
-            issues.append("Title too short (<30 characters)")
-        
-        # Meta description analysis
-        meta_description = parsed_data['meta_description']
-        if not meta_description:
-            seo_score -= 15
-            issues.append("Missing meta description")
-        elif len(meta_description) > 160:
-            seo_score -= 8
-            issues.append("Meta description too long (>160 characters)")
-        elif len(meta_description) < 120:
-            seo_score -= 5
-            issues.append("Meta description too short (<120 characters)")
-        
-        # Heading structure analysis
-        headings = parsed_data['headings']
-        if not headings['h1']:
-            seo_score -= 15
-            issues.append("Missing H1 tag")
-        elif len(headings['h1']) > 1:
-            seo_score -= 10
-            issues.append("Multiple H1 tags found")
-        
-        # Content analysis
-        word_count = parsed_data['word_count']
-        if word_count < 300:
-            seo_score -= 15
-            issues.append("Low word count (<300 words)")
-        
-        # Internal vs external links
-        internal_links = len([link for link in parsed_data['links'] if not link['external']])
-        external_links = len([link for link in parsed_data['links'] if link['external']])
-        
-        if internal_links == 0:
-            seo_score -= 10
-            issues.append("No internal links found")
-        
-        return {
-            'score': max(seo_score, 0),
-            'title_length': len(title),
-            'meta_description_length': len(meta_description),
-            'word_count': word_count,
-            'h1_count': len(headings['h1']),
-            'internal_links': internal_links,
-            'external_links': external_links,
-            'issues': issues
-        }
+        return score_seo(
+            parsed_data['title'],
+            parsed_data['meta_description'],
+            len(parsed_data['headings']['h1']),
+            parsed_data['word_count'],
+            parsed_data['internal_links'],
+            parsed_data['external_links']
+        )
     
     def analyze_technical_health(self, parsed_data: dict, url: str):
         """Analyze technical health factors"""
-        technical_score = 100
-        issues = []
-        
-        # HTTPS check
-        if not url.startswith('https://'):
-            technical_score -= 20
-            issues.append("Website not using HTTPS")
-        
-        # Meta viewport check
-        if 'viewport' not in parsed_data['meta_tags']:
-            technical_score -= 15
-            issues.append("Missing viewport meta tag")
-        
-        # Structured data check (basic)
-        if 'description' not in parsed_data['meta_tags']:
-            technical_score -= 10
-            issues.append("Missing meta description")
-        
-        return {
-            'score': max(technical_score, 0),
-            'https_enabled': url.startswith('https://'),
-            'has_viewport': 'viewport' in parsed_data['meta_tags'],
-            'issues': issues
-        }
+        meta_tags = parsed_data['meta_tags']
+        return score_technical_health(url.startswith('https://'), 'viewport' in meta_tags, 'description' in meta_tags)
     
     def analyze_accessibility(self, parsed_data: dict):
         """Analyze accessibility factors"""
-        accessibility_score = 100
-        issues = []
-        
-        # Image alt text analysis
-        images_without_alt = len([img for img in parsed_data['images'] if not img['has_alt']])
-        total_images = len(parsed_data['images'])
-        
-        if total_images > 0:
-            alt_percentage = ((total_images - images_without_alt) / total_images) * 100
-            if alt_percentage < 80:
-                accessibility_score -= 25
-                issues.append(f"Only {alt_percentage:.0f}% of images have alt text")
-            elif alt_percentage < 90:
-                accessibility_score -= 15
-                issues.append(f"{alt_percentage:.0f}% of images have alt text (should be 100%)")
-        
-        # Heading structure
-        headings = parsed_data['headings']
-        if not headings['h1']:
-            accessibility_score -= 15
-            issues.append("Missing H1 heading for screen readers")
-        
-        return {
-            'score': max(accessibility_score, 0),
-            'images_with_alt_percentage': ((total_images - images_without_alt) / total_images * 100) if total_images > 0 else 100,
-            'issues': issues
-        }
+        return score_accessibility(parsed_data['images_total'], parsed_data['images_without_alt'], len(parsed_data['headings']['h1']))
     
-    def analyze_schema_and_faq(self, parsed_data: dict, html_content: str):
+    def analyze_schema_and_faq(self, parsed_data: dict, tree: LexborHTMLParser):
         """Analyze schema markup and FAQ structure"""
-        soup = BeautifulSoup(html_content, 'html.parser')
         
         # Schema analysis
-        schema_data = self.detect_schema_markup(soup)
+        schema_data, faq_schema_elements = self.detect_schema_markup(tree)
         
         # FAQ analysis  
-        faq_data = self.detect_faq_structure(soup, parsed_data)
+        faq_data = self.detect_faq_structure(tree, parsed_data, faq_schema_elements)
         
         # Determine checkpoint category
         has_schema = schema_data['has_schema']
@@ -477,26 +904,30 @@ class WebsiteAnalyzer:
             'issues': schema_data['issues'] + faq_data['issues']
         }
     
-    def detect_schema_markup(self, soup):
-        """Detect various types of schema markup"""
+    def detect_schema_markup(self, tree: LexborHTMLParser):
+        """Detect various types of schema markup, also returning the FAQ microdata elements"""
         issues = []
         schema_types = []
         has_schema = False
         schema_locations = []
         
         # JSON-LD Detection
-        json_ld_scripts = soup.find_all('script', type='application/ld+json')
+        json_ld_scripts = tree.css('script[type="application/ld+json"]')
         json_ld_schemas = []
         
         for i, script in enumerate(json_ld_scripts):
             try:
-                schema_data = json.loads(script.string)
+                script_text = script.text()
+                # Without an @type key nothing would be recorded, so skip parsing (large catalogs can run to MBs)
+                if JSON_LD_TYPE_KEY not in script_text:
+                    continue
+                schema_data = orjson.loads(script_text)
                 location_info = {
                     'type': 'JSON-LD',
                     'element': 'script',
                     'position': i + 1,
-                    'parent': script.parent.name if script.parent else 'unknown',
-                    'content_preview': script.string[:100] + '...' if len(script.string) > 100 else script.string
+                    'parent': script.parent.tag if script.parent else 'unknown',
+                    'content_preview': truncate_preview(script_text, 100)
                 }
                 
                 if isinstance(schema_data, dict) and '@type' in schema_data:
@@ -513,49 +944,60 @@ class WebsiteAnalyzer:
                             location_info['schema_type'] = item['@type']
                             schema_locations.append(location_info.copy())
                             has_schema = True
-            except (json.JSONDecodeError, KeyError):
+            except (orjson.JSONDecodeError, KeyError):
                 continue
         
+        # Microdata and RDFa elements, collected in one traversal and split by attribute
+        microdata_elements = []
+        rdfa_elements = []
+        for element in tree.css(':is([itemscope], [typeof])'):
+            attrs = element.attributes
+            if 'itemscope' in attrs:
+                microdata_elements.append(element)
+            if 'typeof' in attrs:
+                rdfa_elements.append(element)
+        
         # Microdata Detection
-        microdata_elements = soup.find_all(attrs={'itemscope': True})
         microdata_types = []
+        faq_schema_elements = []
         
         for i, element in enumerate(microdata_elements):
-            itemtype = element.get('itemtype')
+            itemtype = element.attributes.get('itemtype')
             if itemtype:
+                if is_faq_itemtype(itemtype):
+                    faq_schema_elements.append(element)
                 microdata_types.append(itemtype)
                 schema_types.append(f"Microdata: {itemtype}")
                 
                 location_info = {
                     'type': 'Microdata',
-                    'element': element.name,
+                    'element': element.tag,
                     'position': i + 1,
                     'itemtype': itemtype,
-                    'class': element.get('class', []),
-                    'id': element.get('id', ''),
-                    'text_preview': element.get_text()[:50] + '...' if len(element.get_text()) > 50 else element.get_text()
+                    'class': class_list(element),
+                    'id': element.attributes.get('id') or '',
+                    'text_preview': text_preview(element)
                 }
                 schema_locations.append(location_info)
                 has_schema = True
         
         # RDFa Detection
-        rdfa_elements = soup.find_all(attrs={'typeof': True})
         rdfa_types = []
         
         for i, element in enumerate(rdfa_elements):
-            typeof = element.get('typeof')
+            typeof = element.attributes.get('typeof')
             if typeof:
                 rdfa_types.append(typeof)
                 schema_types.append(f"RDFa: {typeof}")
                 
                 location_info = {
                     'type': 'RDFa',
-                    'element': element.name,
+                    'element': element.tag,
                     'position': i + 1,
                     'typeof': typeof,
-                    'property': element.get('property', ''),
-                    'class': element.get('class', []),
-                    'text_preview': element.get_text()[:50] + '...' if len(element.get_text()) > 50 else element.get_text()
+                    'property': element.attributes.get('property') or '',
+                    'class': class_list(element),
+                    'text_preview': text_preview(element)
                 }
                 schema_locations.append(location_info)
                 has_schema = True
@@ -569,7 +1011,7 @@ class WebsiteAnalyzer:
             if not faq_schemas:
                 issues.append("No FAQ-specific schema markup found")
         
-        return {
+        schema_data = {
             'has_schema': has_schema,
             'json_ld_count': len(json_ld_scripts),
             'microdata_count': len(microdata_elements),
@@ -581,93 +1023,79 @@ class WebsiteAnalyzer:
             'schema_locations': schema_locations,
             'issues': issues
         }
+        
+        return schema_data, faq_schema_elements
     
-    def detect_faq_structure(self, soup, parsed_data):
+    def detect_faq_structure(self, tree: LexborHTMLParser, parsed_data: dict, faq_schema_elements: list):
         """Detect FAQ structure on the page"""
         issues = []
         has_faq = False
         faq_indicators = []
         faq_locations = []
         
-        # Text-based FAQ detection
+        # Text-based FAQ detection; each pattern is scanned separately so overlapping matches are all reported
         text_content = parsed_data.get('text_content', '').lower()
-        faq_patterns = [
-            r'frequently asked questions?',
-            r'f\.?a\.?q\.?s?',
-            r'common questions?',
-            r'questions? (?:and|&) answers?',
-            r'q\s*&\s*a',
-            r'help (?:and|&) support'
-        ]
-        
-        for pattern in faq_patterns:
-            matches = re.finditer(pattern, text_content)
-            for match in matches:
-                has_faq = True
-                faq_indicators.append(f"Text pattern: {pattern}")
-                faq_locations.append({
-                    'type': 'Text Pattern',
-                    'pattern': pattern,
-                    'matched_text': match.group(),
-                    'position': match.start()
-                })
-        
-        # Heading-based FAQ detection
-        all_headings = []
-        for level in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-            headings = soup.find_all(level)
-            for i, heading in enumerate(headings):
-                all_headings.append({
-                    'level': level,
-                    'text': heading.get_text().strip(),
-                    'element': heading,
-                    'position': i + 1
-                })
-        
-        faq_heading_patterns = [
-            r'faq',
-            r'frequently asked',
-            r'common questions',
-            r'questions?.*answers?',
-            r'help.*support'
-        ]
-        
-        for heading_info in all_headings:
-            heading_lower = heading_info['text'].lower()
-            for pattern in faq_heading_patterns:
-                if re.search(pattern, heading_lower):
+        if FAQ_TEXT_RE.search(text_content):
+            for pattern_re in FAQ_TEXT_PATTERN_RES:
+                for match in pattern_re.finditer(text_content):
                     has_faq = True
-                    faq_indicators.append(f"Heading: {heading_info['text']}")
+                    faq_indicators.append(f"Text pattern: {pattern_re.pattern}")
                     faq_locations.append({
-                        'type': 'Heading',
-                        'level': heading_info['level'].upper(),
-                        'text': heading_info['text'],
-                        'pattern_matched': pattern,
-                        'position': heading_info['position']
+                        'type': 'Text Pattern',
+                        'pattern': pattern_re.pattern,
+                        'matched_text': match.group(),
+                        'position': match.start()
                     })
-                    break
-        
-        # Structure-based FAQ detection (Q&A pairs)
-        question_indicators = soup.find_all(text=re.compile(r'^\s*(?:Q\d*[:.]?|Question\d*[:.]?|\?)', re.IGNORECASE))
-        answer_indicators = soup.find_all(text=re.compile(r'^\s*(?:A\d*[:.]?|Answer\d*[:.]?)', re.IGNORECASE))
         
-        if len(question_indicators) >= 2 and len(answer_indicators) >= 2:
+        # Heading-based FAQ detection, reusing the headings collected by parse_html_content
+        for level, heading_texts in parsed_data['headings'].items():
+            for i, heading_text in enumerate(heading_texts):
+                heading_lower = heading_text.lower()
+                # Most headings match nothing, so reject them with one combined scan first
+                if not FAQ_HEADING_RE.search(heading_lower):
+                    continue
+                for pattern_re in FAQ_HEADING_PATTERNS:
+                    if pattern_re.search(heading_lower):
+                        pattern = pattern_re.pattern
+                        has_faq = True
+                        faq_indicators.append(f"Heading: {heading_text}")
+                        faq_locations.append({
+                            'type': 'Heading',
+                            'level': level.upper(),
+                            'text': heading_text,
+                            'pattern_matched': pattern,
+                            'position': i + 1
+                        })
+                        break
+        
+        # Structure-based FAQ detection (Q&A pairs), counted with one linear scan of the page text.
+        # text_content runs adjacent nodes together, so join the text nodes by line instead, flattening
+        # the line breaks inside each node so markers only match where a node starts, not where its source wraps.
+        # The nodes are collected once and reused when locating the first questions below
+        text_nodes = list(iter_text_nodes(tree))
+        node_texts = [node.text_content.replace('\n', ' ') for node in text_nodes]
+        page_text = '\n'.join(node_texts)
+        question_count = len(FAQ_QUESTION_RE.findall(page_text))
+        answer_count = len(FAQ_ANSWER_RE.findall(page_text))
+        
+        if question_count >= 2 and answer_count >= 2:
             has_faq = True
-            faq_indicators.append(f"Q&A structure: {len(question_indicators)} questions, {len(answer_indicators)} answers")
+            faq_indicators.append(f"Q&A structure: {question_count} questions, {answer_count} answers")
             
-            # Capture locations of Q&A elements
-            for i, q in enumerate(question_indicators[:3]):  # Limit to first 3 for brevity
+            # Capture locations of Q&A elements, walking the text nodes only until the first 3 are found
+            question_nodes = (node for node, node_text in zip(text_nodes, node_texts) if FAQ_QUESTION_RE.match(node_text))
+            for i, q in enumerate(itertools.islice(question_nodes, 3)):  # Limit to first 3 for brevity
                 parent = q.parent if q.parent else None
                 faq_locations.append({
                     'type': 'Question Element',
-                    'text': str(q).strip()[:50] + '...' if len(str(q)) > 50 else str(q).strip(),
-                    'parent_element': parent.name if parent else 'unknown',
-                    'parent_class': parent.get('class', []) if parent else [],
+                    'text': truncate_preview(q.text_content.strip()),
+                    'parent_element': parent.tag if parent else 'unknown',
+                    'parent_class': class_list(parent) if parent else [],
                     'position': i + 1
                 })
         
         # Check for FAQ-specific HTML structures
-        faq_containers = soup.find_all(attrs={'class': re.compile(r'faq|question|accordion', re.IGNORECASE)})
+        faq_containers = tree.css(FAQ_CLASS_SELECTOR)
         if len(faq_containers) >= 2:
             has_faq = True
             faq_indicators.append(f"FAQ containers: {len(faq_containers)} elements")
@@ -676,15 +1104,14 @@ class WebsiteAnalyzer:
             for i, container in enumerate(faq_containers[:3]):  # Limit to first 3
                 faq_locations.append({
                     'type': 'FAQ Container',
-                    'element': container.name,
-                    'class': container.get('class', []),
-                    'id': container.get('id', ''),
-                    'text_preview': container.get_text()[:50] + '...' if len(container.get_text()) > 50 else container.get_text(),
+                    'element': container.tag,
+                    'class': class_list(container),
+                    'id': container.attributes.get('id') or '',
+                    'text_preview': text_preview(container),
                     'position': i + 1
                 })
         
-        # Schema-based FAQ detection
-        faq_schema_elements = soup.find_all(attrs={'itemtype': re.compile(r'FAQPage|Question', re.IGNORECASE)})
+        # Schema-based FAQ detection, using the FAQ microdata found by detect_schema_markup
         if faq_schema_elements:
             has_faq = True
             faq_indicators.append(f"Schema FAQ elements: {len(faq_schema_elements)}")
@@ -693,10 +1120,10 @@ class WebsiteAnalyzer:
             for i, element in enumerate(faq_schema_elements):
                 faq_locations.append({
                     'type': 'Schema FAQ',
-                    'element': element.name,
-                    'itemtype': element.get('itemtype', ''),
-                    'class': element.get('class', []),
-                    'text_preview': element.get_text()[:50] + '...' if len(element.get_text()) > 50 else element.get_text(),
+                    'element': element.tag,
+                    'itemtype': element.attributes.get('itemtype') or '',
+                    'class': class_list(element),
+                    'text_preview': text_preview(element),
                     'position': i + 1
                 })
         
@@ -707,8 +1134,8 @@ class WebsiteAnalyzer:
             'has_faq': has_faq,
             'faq_indicators': faq_indicators,
             'faq_locations': faq_locations,
-            'question_count': len(question_indicators),
-            'answer_count': len(answer_indicators),
+            'question_count': question_count,
+            'answer_count': answer_count,
             'faq_containers': len(faq_containers),
             'issues': issues
         }
@@ -721,17 +1148,8 @@ class WebsiteAnalyzer:
         accessibility_score = accessibility_data['score']
         schema_faq_score = schema_faq_data['score']
         
-        # Weighted overall score (adjusted for new schema/FAQ component)
-        overall_score = int(
-            (performance_score * 0.25) +
-            (seo_score * 0.35) +
-            (technical_score * 0.15) +
-            (accessibility_score * 0.10) +
-            (schema_faq_score * 0.15)
-        )
-        
         return {
-            'overall': overall_score,
+            'overall': overall_score(performance_score, seo_score, technical_score, accessibility_score, schema_faq_score),
             'performance': performance_score,
             'seo': seo_score,
             'technical': technical_score,
@@ -742,45 +1160,57 @@ class WebsiteAnalyzer:
     async def generate_ai_insights(self, parsed_data: dict, performance_data: dict, seo_data: dict, technical_data: dict, url: str):
         """Generate AI-powered insights and recommendations"""
         try:
-            # Initialize AI chat
-            chat = LlmChat(
-                api_key=self.openai_api_key,
-                session_id=f"analysis_{int(time.time())}",
-                system_message="You are an expert SEO and web performance consultant. Analyze the provided website data and provide specific, actionable recommendations for improvement."
-            ).with_model("openai", "gpt-4o-mini").with_max_tokens(1500)
-            
             # Prepare analysis data for AI
             analysis_summary = f"""
 Website: {url}
 Title: {parsed_data.get('title', 'N/A')}
 Meta Description: {parsed_data.get('meta_description', 'N/A')}
-Word Count: {parsed_data.get('word_count', 0)}
-H1 Tags: {len(parsed_data.get('headings', {}).get('h1', []))}
-Images: {len(parsed_data.get('images', []))}
-Internal Links: {len([l for l in parsed_data.get('links', []) if not l.get('external', True)])}
-External Links: {len([l for l in parsed_data.get('links', []) if l.get('external', False)])}
-
-Performance Issues: {', '.join(performance_data.get('issues', []))}
-SEO Issues: {', '.join(seo_data.get('issues', []))}
-Technical Issues: {', '.join(technical_data.get('issues', []))}
-
-Current Scores:
-- Performance: {performance_data.get('score', 0)}/100
-- SEO: {seo_data.get('score', 0)}/100
-- Technical: {technical_data.get('score', 0)}/100
+Word Count: {seo_data.get('word_count', 0)}
+H1 Tags: {seo_data.get('h1_count', 0)}
+Images: {performance_data.get('images_count', 0)}
+Internal Links: {seo_data.get('internal_links', 0)}
+External Links: {seo_data.get('external_links', 0)}
 """
+            
+            # Only categories with room for improvement are described, with their top issues
+            for category, category_data in (("Performance", performance_data), ("SEO", seo_data), ("Technical", technical_data)):
+                score = category_data.get('score', 0)
+                if score >= AI_SUMMARY_SCORE_CUTOFF:
+                    continue
+                analysis_summary += f"{category} Score: {score}/100\n"
+                issues = category_data.get('issues')
+                if issues:
+                    analysis_summary += f"{category} Issues: {', '.join(issues[:AI_SUMMARY_MAX_ISSUES])}\n"
+            
+            # Identical analysis inputs get the recommendations already generated for them
+            summary_hash = hashlib.sha256(analysis_summary.encode()).hexdigest()
+            cached_insights = ai_insights_cache.get(summary_hash)
+            if cached_insights is not None:
+                return cached_insights
+            
+            # Initialize AI chat
+            chat = LlmChat(
+                api_key=self.openai_api_key,
+                session_id=f"analysis_{int(time.time())}",
+                system_message=AI_SYSTEM_MESSAGE
+            ).with_model("openai", "gpt-4o-mini").with_max_tokens(800)
 
-            user_message = UserMessage(
-                text=f"Analyze this website data and provide 5 specific, actionable recommendations to improve SEO and performance. Format as JSON with 'recommendations' array containing objects with 'title', 'description', 'priority' (High/Medium/Low), and 'impact' fields:\n\n{analysis_summary}"
-            )
+            user_message = UserMessage(text=AI_RECOMMENDATIONS_PROMPT + analysis_summary)
             
-            response = await chat.send_message(user_message)
+            async with self.ai_semaphore:
+                response = await chat.send_message(user_message)
             
-            # Try to parse AI response as JSON
+            # Try to parse AI response as JSON, ignoring any code fences or preamble around the object
             try:
-                ai_data = json.loads(response)
+                ai_json = response[response.find('{'):response.rfind('}') + 1]
+                # Unusually large responses are decoded off the event loop
+                if len(ai_json) > AI_INLINE_DECODE_LIMIT:
+                    ai_data = await asyncio.to_thread(orjson.loads, ai_json)
+                else:
+                    ai_data = orjson.loads(ai_json)
+                ai_insights_cache[summary_hash] = ai_data
                 return ai_data
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 # Fallback if AI doesn't return valid JSON
                 return {
                     "recommendations": [
@@ -821,33 +1251,24 @@ Current Scores:
     
     def generate_pdf_report(self, analysis_result: dict):
         """Generate PDF report from analysis result"""
+        # ReportLab is only needed for exports, so keep it out of worker startup
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer, PageBreak
+        from reportlab.lib.units import inch
+        
         buffer = BytesIO()
         
         # Create PDF document
         doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch, bottomMargin=0.5*inch)
-        styles = getSampleStyleSheet()
+        styles = load_pdf_styles()
         story = []
         
         # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            textColor=colors.HexColor('#1e40af'),
-            alignment=1  # Center alignment
-        )
-        story.append(Paragraph("Website Analysis Report", title_style))
+        story.append(Paragraph("Website Analysis Report", styles['CustomTitle']))
         story.append(Spacer(1, 20))
         
         # Website URL and basic info
-        url_style = ParagraphStyle(
-            'URLStyle',
-            parent=styles['Normal'],
-            fontSize=14,
-            spaceAfter=20,
-            alignment=1
-        )
+        url_style = styles['URLStyle']
         story.append(Paragraph(f"<b>Website:</b> {analysis_result['url']}", url_style))
         
         # Format the datetime object properly
@@ -862,14 +1283,7 @@ Current Scores:
         story.append(Spacer(1, 20))
         
         # Overall Score Section
-        score_style = ParagraphStyle(
-            'ScoreStyle',
-            parent=styles['Heading2'],
-            fontSize=18,
-            spaceAfter=15,
-            textColor=colors.HexColor('#059669')
-        )
-        story.append(Paragraph(f"Overall Score: {analysis_result['overall_score']}/100", score_style))
+        story.append(Paragraph(f"Overall Score: {analysis_result['overall_score']}/100", styles['ScoreStyle']))
         story.append(Spacer(1, 20))
         
         # Scores Table
@@ -883,48 +1297,48 @@ Current Scores:
         ]
         
         scores_table = Table(scores_data, colWidths=[2*inch, 1*inch, 1.5*inch])
-        scores_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e5e7eb')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        scores_table.setStyle(load_scores_table_style())
         story.append(scores_table)
         story.append(Spacer(1, 30))
         
         # Schema & FAQ Analysis Section
         story.append(Paragraph("Schema & FAQ Analysis", styles['Heading2']))
         schema_faq = analysis_result.get('schema_faq_analysis', {})
-        story.append(Paragraph(f"<b>Category:</b> {schema_faq.get('category_label', 'N/A')}", styles['Normal']))
-        story.append(Paragraph(f"<b>Has Schema:</b> {'Yes' if schema_faq.get('has_schema') else 'No'}", styles['Normal']))
-        story.append(Paragraph(f"<b>Has FAQ:</b> {'Yes' if schema_faq.get('has_faq') else 'No'}", styles['Normal']))
+        story.append(Paragraph(
+            f"<b>Category:</b> {schema_faq.get('category_label', 'N/A')}<br/>"
+            f"<b>Has Schema:</b> {'Yes' if schema_faq.get('has_schema') else 'No'}<br/>"
+            f"<b>Has FAQ:</b> {'Yes' if schema_faq.get('has_faq') else 'No'}",
+            styles['Normal']
+        ))
         story.append(Spacer(1, 15))
         
         # Schema Details
         if schema_faq.get('has_schema'):
             story.append(Paragraph("Schema Details:", styles['Heading3']))
             schema_details = schema_faq.get('schema_details', {})
-            story.append(Paragraph(f"• JSON-LD Scripts: {schema_details.get('json_ld_count', 0)}", styles['Normal']))
-            story.append(Paragraph(f"• Microdata Elements: {schema_details.get('microdata_count', 0)}", styles['Normal']))
-            story.append(Paragraph(f"• RDFa Elements: {schema_details.get('rdfa_count', 0)}", styles['Normal']))
+            story.append(Paragraph(
+                f"• JSON-LD Scripts: {schema_details.get('json_ld_count', 0)}<br/>"
+                f"• Microdata Elements: {schema_details.get('microdata_count', 0)}<br/>"
+                f"• RDFa Elements: {schema_details.get('rdfa_count', 0)}",
+                styles['Normal']
+            ))
             
             if schema_details.get('schema_types'):
-                story.append(Paragraph("Schema Types Found:", styles['Normal']))
-                for schema_type in schema_details['schema_types'][:5]:  # Limit to first 5
-                    story.append(Paragraph(f"  - {schema_type}", styles['Normal']))
+                schema_type_lines = ["Schema Types Found:"]
+                schema_type_lines.extend(f"  - {schema_type}" for schema_type in schema_details['schema_types'][:5])  # Limit to first 5
+                story.append(Paragraph('<br/>'.join(schema_type_lines), styles['Normal']))
             story.append(Spacer(1, 15))
         
         # FAQ Details
         if schema_faq.get('has_faq'):
             story.append(Paragraph("FAQ Details:", styles['Heading3']))
             faq_details = schema_faq.get('faq_details', {})
-            story.append(Paragraph(f"• Questions Found: {faq_details.get('question_count', 0)}", styles['Normal']))
-            story.append(Paragraph(f"• Answers Found: {faq_details.get('answer_count', 0)}", styles['Normal']))
-            story.append(Paragraph(f"• FAQ Containers: {faq_details.get('faq_containers', 0)}", styles['Normal']))
+            story.append(Paragraph(
+                f"• Questions Found: {faq_details.get('question_count', 0)}<br/>"
+                f"• Answers Found: {faq_details.get('answer_count', 0)}<br/>"
+                f"• FAQ Containers: {faq_details.get('faq_containers', 0)}",
+                styles['Normal']
+            ))
             story.append(Spacer(1, 15))
         
         # AI Recommendations Section
@@ -936,10 +1350,13 @@ Current Scores:
         
         for i, rec in enumerate(recommendations[:5], 1):  # Limit to first 5 recommendations
             story.append(Paragraph(f"{i}. {rec.get('title', 'N/A')}", styles['Heading3']))
-            story.append(Paragraph(f"<b>Priority:</b> {rec.get('priority', 'N/A')}", styles['Normal']))
-            story.append(Paragraph(f"<b>Description:</b> {rec.get('description', 'N/A')}", styles['Normal']))
+            rec_lines = [
+                f"<b>Priority:</b> {rec.get('priority', 'N/A')}",
+                f"<b>Description:</b> {rec.get('description', 'N/A')}"
+            ]
             if rec.get('impact'):
-                story.append(Paragraph(f"<b>Expected Impact:</b> {rec['impact']}", styles['Normal']))
+                rec_lines.append(f"<b>Expected Impact:</b> {rec['impact']}")
+            story.append(Paragraph('<br/>'.join(rec_lines), styles['Normal']))
             story.append(Spacer(1, 15))
         
         # Performance Details Section
@@ -949,21 +1366,27 @@ Current Scores:
         # Performance
         perf_data = analysis_result.get('analysis_data', {}).get('performance', {})
         story.append(Paragraph("Performance Analysis:", styles['Heading3']))
-        story.append(Paragraph(f"• Response Time: {perf_data.get('response_time', 0):.2f} seconds", styles['Normal']))
-        story.append(Paragraph(f"• Page Size: {perf_data.get('content_size', 0) / 1024:.1f} KB", styles['Normal']))
-        story.append(Paragraph(f"• Images: {perf_data.get('images_count', 0)}", styles['Normal']))
-        story.append(Paragraph(f"• Images without Alt: {perf_data.get('images_without_alt', 0)}", styles['Normal']))
+        story.append(Paragraph(
+            f"• Response Time: {perf_data.get('response_time', 0):.2f} seconds<br/>"
+            f"• Page Size: {perf_data.get('content_size', 0) / 1024:.1f} KB<br/>"
+            f"• Images: {perf_data.get('images_count', 0)}<br/>"
+            f"• Images without Alt: {perf_data.get('images_without_alt', 0)}",
+            styles['Normal']
+        ))
         story.append(Spacer(1, 15))
         
         # SEO
         seo_data = analysis_result.get('analysis_data', {}).get('seo', {})
         story.append(Paragraph("SEO Analysis:", styles['Heading3']))
-        story.append(Paragraph(f"• Title Length: {seo_data.get('title_length', 0)} characters", styles['Normal']))
-        story.append(Paragraph(f"• Meta Description Length: {seo_data.get('meta_description_length', 0)} characters", styles['Normal']))
-        story.append(Paragraph(f"• Word Count: {seo_data.get('word_count', 0)}", styles['Normal']))
-        story.append(Paragraph(f"• H1 Tags: {seo_data.get('h1_count', 0)}", styles['Normal']))
-        story.append(Paragraph(f"• Internal Links: {seo_data.get('internal_links', 0)}", styles['Normal']))
-        story.append(Paragraph(f"• External Links: {seo_data.get('external_links', 0)}", styles['Normal']))
+        story.append(Paragraph(
+            f"• Title Length: {seo_data.get('title_length', 0)} characters<br/>"
+            f"• Meta Description Length: {seo_data.get('meta_description_length', 0)} characters<br/>"
+            f"• Word Count: {seo_data.get('word_count', 0)}<br/>"
+            f"• H1 Tags: {seo_data.get('h1_count', 0)}<br/>"
+            f"• Internal Links: {seo_data.get('internal_links', 0)}<br/>"
+            f"• External Links: {seo_data.get('external_links', 0)}",
+            styles['Normal']
+        ))
         
         # Build PDF
         doc.build(story)
@@ -972,39 +1395,69 @@ Current Scores:
     
     def get_score_status(self, score):
         """Get status label for score"""
-        if score >= 80:
-            return "Excellent"
-        elif score >= 60:
-            return "Good"
-        elif score >= 40:
-            return "Fair"
-        else:
-            return "Poor"
+        return SCORE_STATUS_LABELS[bisect_right(SCORE_STATUS_CUTOFFS, score)]
 
 # Initialize analyzer
 analyzer = WebsiteAnalyzer()
 
+def parse_and_score(html_content: str, url: str, response_time: float):
+    """Parse a page and run every analyzer on it, returning only picklable results for the process pool"""
+    parsed_data, tree = analyzer.parse_html_content(html_content, url)
+    return (
+        parsed_data,
+        analyzer.analyze_performance(parsed_data, response_time, len(html_content)),
+        analyzer.analyze_seo(parsed_data),
+        analyzer.analyze_technical_health(parsed_data, url),
+        analyzer.analyze_accessibility(parsed_data),
+        analyzer.analyze_schema_and_faq(parsed_data, tree)
+    )
+
+def build_pdf_report(analysis_result: dict):
+    """Render the PDF report of an analysis to bytes, so exports can run in the process pool"""
+    return analyzer.generate_pdf_report(analysis_result).getvalue()
+
 # API Routes
 @api_router.get("/")
 async def root():
     return {"message": "AI Website Analyzer API"}
 
-@api_router.post("/analyze", response_model=dict)
-async def start_analysis(request: AnalysisRequest, background_tasks: BackgroundTasks):
+@api_router.post("/analyze")
+async def start_analysis(request: AnalysisRequest):
     """Start website analysis"""
     # Validate URL
     if not request.url or request.url.strip() == "":
         raise HTTPException(status_code=400, detail="URL is required")
     
+    if analyzer.analysis_queue.full():
+        raise HTTPException(status_code=503, detail=ANALYSIS_QUEUE_FULL_MESSAGE)
+    
     try:
-        # Start analysis in background
-        background_tasks.add_task(analyzer.analyze_website, request.url, request.session_id)
+        # Store the first state before responding, so the session can be polled as soon as this returns
+        await save_progress(request.session_id, {
+            "progress": 0,
+            "status": "queued",
+            "message": "Waiting for an analysis worker..."
+        }, immediate=True)
+        
+        # Queue the analysis for the worker tasks
+        try:
+            analyzer.analysis_queue.put_nowait((request.url, request.session_id))
+        except asyncio.QueueFull:
+            # The queue filled up while the first state was being stored
+            await save_progress(request.session_id, {
+                "progress": 0,
+                "status": "error",
+                "message": ANALYSIS_QUEUE_FULL_MESSAGE
+            }, immediate=True)
+            raise HTTPException(status_code=503, detail=ANALYSIS_QUEUE_FULL_MESSAGE)
         
         return {
             "session_id": request.session_id,
             "status": "started",
             "message": "Analysis started"
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to start analysis: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1012,35 +1465,134 @@ async def start_analysis(request: AnalysisRequest, background_tasks: BackgroundT
 @api_router.get("/progress/{session_id}")
 async def get_progress(session_id: str):
     """Get analysis progress"""
-    if session_id not in analysis_progress:
+    progress_data = await load_progress(session_id)
+    if progress_data is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    return progress_data
+
+@api_router.get("/progress/{session_id}/stream")
+async def stream_progress_events(session_id: str):
+    """Stream analysis progress as server-sent events"""
+    if await load_progress(session_id) is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    return analysis_progress[session_id]
+    return StreamingResponse(
+        stream_progress(session_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+async def load_result_payload(session_id: str):
+    """Load an analysis result from Mongo as JSON bytes, or None if it does not exist"""
+    # Leave the MongoDB ObjectId out of the document so it can be serialized as is
+    result = await db.analyses.find_one({"session_id": session_id}, {"_id": 0})
+    if not result:
+        return None
+    
+    # Encode once with orjson and reuse the bytes for the cache and the response
+    payload = orjson.dumps(result)
+    await cache_result_payload(session_id, payload)
+    
+    return payload
+
+def result_response(payload, request: Request):
+    """Build a result response tagged with an ETag, or an empty 304 if the client already has it"""
+    if isinstance(payload, str):
+        payload = payload.encode()
+    
+    # Completed results never change, so the body hash identifies them for good
+    etag = f'"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=60"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match == "*" or etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=payload, media_type="application/json", headers=headers)
 
 @api_router.get("/result/{session_id}")
-async def get_result(session_id: str):
+async def get_result(session_id: str, request: Request):
     """Get analysis result"""
-    result = await db.analyses.find_one({"session_id": session_id})
+    if redis_client:
+        cached = await redis_client.get(result_cache_key(session_id))
+    else:
+        cached = result_payloads.get(session_id)
+    if cached:
+        return result_response(cached, request)
+    
+    # Concurrent requests for the same session wait on a single database lookup
+    lookup = inflight_results.get(session_id)
+    if lookup is None:
+        lookup = asyncio.create_task(load_result_payload(session_id))
+        inflight_results[session_id] = lookup
+        lookup.add_done_callback(lambda _: inflight_results.pop(session_id, None))
+    
+    # Shield the shared lookup so one client disconnecting does not cancel it for the others
+    payload = await asyncio.shield(lookup)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Result not found")
+    
+    return result_response(payload, request)
+
+@api_router.get("/result/{session_id}/content")
+async def get_result_content(session_id: str):
+    """Get the parsed page content of an analysis; links and images are a sample of the first few on the page"""
+    result = await db.analyses.find_one(
+        {"session_id": session_id},
+        {"_id": 0, "parsed_content_id": 1, "analysis_data.parsed_content": 1}
+    )
     if not result:
         raise HTTPException(status_code=404, detail="Result not found")
     
-    # Remove MongoDB ObjectId for JSON serialization
-    if '_id' in result:
-        del result['_id']
+    parsed_content = result.get('analysis_data', {}).get('parsed_content', {})
+    
+    # Older analyses embed the full content; newer ones keep the bulky fields in analysis_blobs
+    if result.get('parsed_content_id'):
+        blob = await db.analysis_blobs.find_one({"_id": result['parsed_content_id']})
+        if blob:
+            parsed_content = {**parsed_content, **blob['parsed_content']}
+    
+    # Tell clients when the stored lists are only a sample of what the page contains
+    links = parsed_content.get('links', [])
+    images = parsed_content.get('images', [])
+    # Documents written before the link counters were stored hold the full list instead
+    if 'internal_links' in parsed_content or 'external_links' in parsed_content:
+        links_total = parsed_content.get('internal_links', 0) + parsed_content.get('external_links', 0)
+    else:
+        links_total = len(links)
+    images_total = parsed_content.get('images_total', len(images))
+    parsed_content['links_total'] = links_total
+    parsed_content['links_truncated'] = len(links) < links_total
+    parsed_content['images_total'] = images_total
+    parsed_content['images_truncated'] = len(images) < images_total
     
-    return result
+    return parsed_content
 
-@api_router.get("/analyses", response_model=List[dict])
+async def stream_recent_analyses():
+    """Yield the recent analyses as a JSON array, encoding each document as it arrives from Mongo"""
+    chunks = [b'[']
+    yield chunks[0]
+    cursor = db.analyses.find({}, RECENT_ANALYSES_PROJECTION).sort("created_at", -1).limit(10)
+    async for analysis in cursor:
+        chunk = (b',' if len(chunks) > 1 else b'') + orjson.dumps(analysis)
+        chunks.append(chunk)
+        yield chunk
+    chunks.append(b']')
+    yield chunks[-1]
+    
+    # Cache the complete list once it has been streamed
+    if redis_client:
+        await redis_client.set(RECENT_ANALYSES_CACHE_KEY, b''.join(chunks), ex=RECENT_ANALYSES_CACHE_TTL)
+
+@api_router.get("/analyses")
 async def get_recent_analyses():
     """Get recent analyses"""
-    analyses = await db.analyses.find().sort("created_at", -1).limit(10).to_list(10)
+    if redis_client:
+        cached = await redis_client.get(RECENT_ANALYSES_CACHE_KEY)
+        if cached:
+            return Response(content=cached, media_type="application/json")
     
-    # Clean up MongoDB ObjectIds
-    for analysis in analyses:
-        if '_id' in analysis:
-            del analysis['_id']
-    
-    return analyses
+    return StreamingResponse(stream_recent_analyses(), media_type="application/json")
 
 @api_router.get("/export/{session_id}")
 async def export_analysis(session_id: str, format: str = "pdf"):
@@ -1049,20 +1601,19 @@ async def export_analysis(session_id: str, format: str = "pdf"):
     if format.lower() != "pdf":
         raise HTTPException(status_code=400, detail="Only PDF format is currently supported")
     
-    result = await db.analyses.find_one({"session_id": session_id})
+    result = await db.analyses.find_one({"session_id": session_id}, {"_id": 0})
     if not result:
         raise HTTPException(status_code=404, detail="Analysis result not found")
     
-    # Remove MongoDB ObjectId for processing
-    if '_id' in result:
-        del result['_id']
-    
     try:
-        pdf_buffer = analyzer.generate_pdf_report(result)
-        
-        # Return PDF as streaming response
-        return StreamingResponse(
-            BytesIO(pdf_buffer.getvalue()),
+        # ReportLab is pure Python, so the report is built in the process pool to keep the event loop free
+        loop = asyncio.get_running_loop()
+        pdf_bytes = await loop.run_in_executor(analyzer.process_pool, build_pdf_report, result)
+        
+        # ReportLab only writes the file once the whole document is built, so send the finished bytes
+        # in one response (with a Content-Length) instead of copying them into a second buffer to stream
+        return Response(
+            pdf_bytes,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename=website_analysis_{session_id[:8]}.pdf"
@@ -1075,27 +1626,44 @@ async def export_analysis(session_id: str, format: str = "pdf"):
 # Legacy routes for compatibility
 @api_router.post("/status", response_model=StatusCheck)
 async def create_status_check(input: StatusCheckCreate):
-    status_dict = input.dict()
+    status_dict = input.model_dump()
     status_obj = StatusCheck(**status_dict)
-    _ = await db.status_checks.insert_one(status_obj.dict())
-    return status_obj
+    _ = await status_checks_collection.insert_one(status_obj.model_dump())
+    # Serialize straight to JSON bytes with pydantic-core instead of re-validating the response model
+    return Response(content=status_obj.model_dump_json(), media_type="application/json")
 
 @api_router.get("/status", response_model=List[StatusCheck])
 async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
-
-# Include the router in the main app
-app.include_router(api_router)
+    # Documents come from our own inserts, so build plain records without re-validating them;
+    # the projection keeps any extra stored fields out, as the Struct rejects unknown keywords
+    cursor = db.status_checks.find({}, STATUS_CHECK_PROJECTION).limit(1000).batch_size(200)
+    status_checks = [StatusCheckRecord(**status_check) async for status_check in cursor]
+    return Response(content=status_check_encoder.encode(status_checks), media_type="application/json")
 
+# Middleware is registered before the router is included
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=[origin.strip() for origin in os.environ.get('CORS_ORIGINS', '*').split(',') if origin.strip()],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+class EventStreamAwareGZipMiddleware(GZipMiddleware):
+    """GZip responses, except progress event streams, which must reach the client unbuffered"""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+app.add_middleware(EventStreamAwareGZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Include the router in the main app
+app.include_router(api_router)
+
+async def create_indexes():
+    """Create the indexes used by the result lookups, analysis cache and recent analyses queries"""
+    await db.analyses.create_index("session_id")
+    await db.analyses.create_index([("url", 1), ("content_hash", 1), ("created_at", -1)])
+    await db.analyses.create_index([("created_at", -1)])
\ No newline at end of file
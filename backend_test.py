@@ -1,10 +1,19 @@
 #!/usr/bin/env python3
-import requests
+import argparse
+import httpx
 import json
-import time
+import re
+import asyncio
 import os
 import sys
 import logging
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -13,27 +22,65 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Decode response bodies with orjson when available
+json_loads = orjson.loads if orjson else json.loads
+
 # Get backend URL from frontend/.env
+@lru_cache(maxsize=1)
 def get_backend_url():
     try:
-        with open('/app/frontend/.env', 'r') as f:
-            for line in f:
-                if line.startswith('REACT_APP_BACKEND_URL='):
-                    return line.strip().split('=')[1].strip('"\'')
+        return re.search(r'^REACT_APP_BACKEND_URL=["\']?([^"\'\n]+)', Path('/app/frontend/.env').read_text(), re.M).group(1)
     except Exception as e:
-        logger.error(f"Error reading backend URL: {e}")
+        logger.error("Error reading backend URL: %s", e)
         sys.exit(1)
 
 # Main backend URL
 BACKEND_URL = get_backend_url()
 API_BASE_URL = f"{BACKEND_URL}/api"
 
-logger.info(f"Using backend URL: {BACKEND_URL}")
-logger.info(f"API base URL: {API_BASE_URL}")
+logger.info("Using backend URL: %s", BACKEND_URL)
+logger.info("API base URL: %s", API_BASE_URL)
+
+# Fields each response must contain, as sets for O(1) membership checks
+REQUIRED_RESULT_FIELDS = frozenset({
+    "session_id", "url", "overall_score", "performance_score", 
+    "seo_score", "technical_score", "accessibility_score", 
+    "schema_faq_score", "analysis_data", "ai_insights", 
+    "schema_faq_analysis", "checkpoint_category"
+})
+REQUIRED_SCHEMA_FAQ_FIELDS = frozenset({"score", "has_schema", "has_faq", "checkpoint_category", "category_label"})
+REQUIRED_RECOMMENDATION_FIELDS = frozenset({"title", "description", "priority", "impact"})
+VALID_CATEGORIES = frozenset({"both_schema_faq", "schema_only", "faq_only", "neither"})
+CATEGORY_FLAGS = {
+    "both_schema_faq": (True, True),
+    "schema_only": (True, False),
+    "faq_only": (False, True),
+    "neither": (False, False),
+}
+
+# Progress polling backs off exponentially from the initial delay up to the cap
+POLL_INITIAL_DELAY = 0.05
+POLL_BACKOFF = 1.5
+POLL_MAX_DELAY = 2.0
+
+# Delays before each result fetch attempt; the first fetch is immediate
+RESULT_RETRY_DELAYS = (0, 0.1, 0.25, 0.5, 1.0)
+
+# Analysis chains run concurrently across URLs, up to this many at once
+DEFAULT_MAX_WORKERS = 8
 
 class WebsiteAnalyzerTester:
     def __init__(self):
-        self.session = requests.Session()
+        # One async HTTP/2 client for the whole run, pooled widely enough that concurrent tests never wait on a connection
+        self.client = httpx.AsyncClient(
+            base_url=API_BASE_URL,
+            timeout=30,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=64)
+            )
+        )
         self.test_results = {
             "total_tests": 0,
             "passed_tests": 0,
@@ -44,9 +91,9 @@ class WebsiteAnalyzerTester:
     def log_test_result(self, test_name, passed, details=None):
         """Log test result and update counters"""
         status = "PASSED" if passed else "FAILED"
-        logger.info(f"Test: {test_name} - {status}")
+        logger.info("Test: %s - %s", test_name, status)
         if details:
-            logger.info(f"Details: {details}")
+            logger.info("Details: %s", details)
         
         self.test_results["total_tests"] += 1
         if passed:
@@ -60,28 +107,29 @@ class WebsiteAnalyzerTester:
             "details": details
         })
     
-    def test_root_endpoint(self):
+    async def test_root_endpoint(self):
         """Test the root API endpoint"""
         try:
-            response = self.session.get(f"{API_BASE_URL}")
-            passed = response.status_code == 200 and "message" in response.json()
-            self.log_test_result("Root API Endpoint", passed, response.json())
+            response = await self.client.get("/")
+            body = json_loads(response.content)
+            passed = response.status_code == 200 and "message" in body
+            self.log_test_result("Root API Endpoint", passed, body)
             return passed
         except Exception as e:
             self.log_test_result("Root API Endpoint", False, str(e))
             return False
     
-    def test_analyze_endpoint(self, url="example.com"):
+    async def test_analyze_endpoint(self, url="example.com"):
         """Test the analyze endpoint with a test URL"""
         try:
             payload = {"url": url}
-            response = self.session.post(f"{API_BASE_URL}/analyze", json=payload)
+            response = await self.client.post("/analyze", json=payload)
             
             if response.status_code != 200:
                 self.log_test_result("Analyze Endpoint", False, f"Status code: {response.status_code}, Response: {response.text}")
                 return None
             
-            result = response.json()
+            result = json_loads(response.content)
             passed = "session_id" in result and "status" in result and result["status"] == "started"
             self.log_test_result("Analyze Endpoint", passed, result)
             
@@ -92,26 +140,30 @@ class WebsiteAnalyzerTester:
             self.log_test_result("Analyze Endpoint", False, str(e))
             return None
     
-    def test_progress_endpoint(self, session_id):
+    async def test_progress_endpoint(self, session_id):
         """Test the progress endpoint with a session ID"""
         try:
-            max_attempts = 30
+            max_attempts = 40  # about a minute with the backoff below
+            previous_body = None
             for attempt in range(max_attempts):
-                response = self.session.get(f"{API_BASE_URL}/progress/{session_id}")
+                response = await self.client.get(f"/progress/{session_id}")
                 
                 if response.status_code != 200:
                     self.log_test_result("Progress Endpoint", False, f"Status code: {response.status_code}, Response: {response.text}")
                     return False
                 
-                progress_data = response.json()
-                logger.info(f"Progress: {progress_data['progress']}%, Status: {progress_data['status']}, Message: {progress_data['message']}")
+                # Only decode the body when progress has actually changed since the last poll
+                if response.content != previous_body:
+                    previous_body = response.content
+                    progress_data = json_loads(previous_body)
+                    logger.info("Progress: %s%%, Status: %s, Message: %s", progress_data['progress'], progress_data['status'], progress_data['message'])
                 
-                # If analysis is completed or failed, break the loop
-                if progress_data["status"] in ["completed", "error"]:
+                # Check right after submitting, and stop as soon as the analysis is completed or failed
+                if progress_data["status"] in ("completed", "error") or attempt == max_attempts - 1:
                     break
                 
-                # Wait before checking again
-                time.sleep(2)
+                # Wait before checking again, polling quickly at first since most analyses finish fast
+                await asyncio.sleep(min(POLL_INITIAL_DELAY * POLL_BACKOFF ** attempt, POLL_MAX_DELAY))
             
             passed = "progress" in progress_data and "status" in progress_data
             self.log_test_result("Progress Endpoint", passed, progress_data)
@@ -120,38 +172,34 @@ class WebsiteAnalyzerTester:
             self.log_test_result("Progress Endpoint", False, str(e))
             return False
     
-    def test_result_endpoint(self, session_id):
+    async def test_result_endpoint(self, session_id):
         """Test the result endpoint with a session ID"""
         try:
-            # Wait a bit to ensure the analysis is complete
-            time.sleep(5)
-            
-            response = self.session.get(f"{API_BASE_URL}/result/{session_id}")
+            # Results are normally stored before completion is reported, so only retry briefly if not yet visible
+            for delay in RESULT_RETRY_DELAYS:
+                await asyncio.sleep(delay)
+                response = await self.client.get(f"/result/{session_id}")
+                if response.status_code not in (404, 409):
+                    break
             
             if response.status_code != 200:
                 self.log_test_result("Result Endpoint", False, f"Status code: {response.status_code}, Response: {response.text}")
                 return None
             
-            result_data = response.json()
+            result_data = json_loads(response.content)
             
             # Check for required fields in the result
-            required_fields = [
-                "session_id", "url", "overall_score", "performance_score", 
-                "seo_score", "technical_score", "accessibility_score", 
-                "schema_faq_score", "analysis_data", "ai_insights", 
-                "schema_faq_analysis", "checkpoint_category"
-            ]
-            
-            missing_fields = [field for field in required_fields if field not in result_data]
+            missing_fields = REQUIRED_RESULT_FIELDS - result_data.keys()
             
             if missing_fields:
-                self.log_test_result("Result Endpoint", False, f"Missing fields: {missing_fields}")
+                self.log_test_result("Result Endpoint", False, f"Missing fields: {sorted(missing_fields)}")
                 return None
             
             # Check if AI insights are present
-            ai_insights_valid = "recommendations" in result_data["ai_insights"]
+            ai_insights = result_data["ai_insights"]
+            ai_insights_valid = "recommendations" in ai_insights
             
-            passed = len(missing_fields) == 0 and ai_insights_valid
+            passed = ai_insights_valid
             self.log_test_result("Result Endpoint", passed, {
                 "session_id": result_data["session_id"],
                 "url": result_data["url"],
@@ -164,7 +212,7 @@ class WebsiteAnalyzerTester:
                     "schema_faq": result_data["schema_faq_score"]
                 },
                 "ai_insights_valid": ai_insights_valid,
-                "recommendation_count": len(result_data["ai_insights"].get("recommendations", []))
+                "recommendation_count": len(ai_insights.get("recommendations", []))
             })
             
             return result_data if passed else None
@@ -172,16 +220,16 @@ class WebsiteAnalyzerTester:
             self.log_test_result("Result Endpoint", False, str(e))
             return None
     
-    def test_analyses_endpoint(self):
+    async def test_analyses_endpoint(self):
         """Test the analyses endpoint to get recent analyses"""
         try:
-            response = self.session.get(f"{API_BASE_URL}/analyses")
+            response = await self.client.get("/analyses")
             
             if response.status_code != 200:
                 self.log_test_result("Analyses Endpoint", False, f"Status code: {response.status_code}, Response: {response.text}")
                 return False
             
-            analyses = response.json()
+            analyses = json_loads(response.content)
             passed = isinstance(analyses, list)
             
             self.log_test_result("Analyses Endpoint", passed, {
@@ -194,20 +242,21 @@ class WebsiteAnalyzerTester:
             self.log_test_result("Analyses Endpoint", False, str(e))
             return False
     
-    def test_error_handling(self):
+    async def test_error_handling(self):
         """Test error handling with invalid inputs"""
         try:
-            # Test with empty URL
-            payload = {"url": ""}
-            response = self.session.post(f"{API_BASE_URL}/analyze", json=payload)
-            empty_url_handled = response.status_code == 400
-            
-            # Test with invalid session ID
-            invalid_session_response = self.session.get(f"{API_BASE_URL}/progress/invalid-session-id")
+            # The probes are independent, so send them concurrently
+            empty_url_response, invalid_session_response, invalid_result_response = await asyncio.gather(
+                # Test with empty URL
+                self.client.post("/analyze", json={"url": ""}),
+                # Test with invalid session ID
+                self.client.get("/progress/invalid-session-id"),
+                # Test with invalid result ID
+                self.client.get("/result/invalid-result-id")
+            )
+            
+            empty_url_handled = empty_url_response.status_code == 400
             invalid_session_handled = invalid_session_response.status_code == 404
-            
-            # Test with invalid result ID
-            invalid_result_response = self.session.get(f"{API_BASE_URL}/result/invalid-result-id")
             invalid_result_handled = invalid_result_response.status_code == 404
             
             passed = empty_url_handled and invalid_session_handled and invalid_result_handled
@@ -223,7 +272,7 @@ class WebsiteAnalyzerTester:
             self.log_test_result("Error Handling", False, str(e))
             return False
     
-    def test_schema_faq_analysis(self, result_data):
+    async def test_schema_faq_analysis(self, result_data):
         """Test schema and FAQ analysis from analysis results"""
         try:
             if not result_data or "schema_faq_analysis" not in result_data:
@@ -233,48 +282,42 @@ class WebsiteAnalyzerTester:
             schema_faq_analysis = result_data["schema_faq_analysis"]
             
             # Check for required fields in schema_faq_analysis
-            required_fields = ["score", "has_schema", "has_faq", "checkpoint_category", "category_label"]
-            missing_fields = [field for field in required_fields if field not in schema_faq_analysis]
+            missing_fields = REQUIRED_SCHEMA_FAQ_FIELDS - schema_faq_analysis.keys()
             
             if missing_fields:
-                self.log_test_result("Schema & FAQ Analysis", False, f"Missing fields: {missing_fields}")
+                self.log_test_result("Schema & FAQ Analysis", False, f"Missing fields: {sorted(missing_fields)}")
                 return False
             
+            has_schema = schema_faq_analysis["has_schema"]
+            has_faq = schema_faq_analysis["has_faq"]
+            category = schema_faq_analysis["checkpoint_category"]
+            
             # Check checkpoint category assignment
-            valid_categories = ["both_schema_faq", "schema_only", "faq_only", "neither"]
-            category_valid = schema_faq_analysis["checkpoint_category"] in valid_categories
+            category_valid = category in VALID_CATEGORIES
             
             # Check consistency between has_schema/has_faq flags and checkpoint_category
-            category_consistent = False
-            if schema_faq_analysis["checkpoint_category"] == "both_schema_faq":
-                category_consistent = schema_faq_analysis["has_schema"] and schema_faq_analysis["has_faq"]
-            elif schema_faq_analysis["checkpoint_category"] == "schema_only":
-                category_consistent = schema_faq_analysis["has_schema"] and not schema_faq_analysis["has_faq"]
-            elif schema_faq_analysis["checkpoint_category"] == "faq_only":
-                category_consistent = not schema_faq_analysis["has_schema"] and schema_faq_analysis["has_faq"]
-            elif schema_faq_analysis["checkpoint_category"] == "neither":
-                category_consistent = not schema_faq_analysis["has_schema"] and not schema_faq_analysis["has_faq"]
+            category_consistent = CATEGORY_FLAGS.get(category) == (has_schema, has_faq)
             
             # Check schema details if schema is detected
             schema_details_valid = True
-            if schema_faq_analysis["has_schema"]:
+            if has_schema:
                 schema_details = schema_faq_analysis.get("schema_details", {})
                 schema_details_valid = "json_ld_count" in schema_details and "microdata_count" in schema_details and "rdfa_count" in schema_details
             
             # Check FAQ details if FAQ is detected
             faq_details_valid = True
-            if schema_faq_analysis["has_faq"]:
+            if has_faq:
                 faq_details = schema_faq_analysis.get("faq_details", {})
                 faq_details_valid = "faq_indicators" in faq_details
             
-            passed = (len(missing_fields) == 0 and category_valid and 
+            passed = (category_valid and 
                      category_consistent and schema_details_valid and faq_details_valid)
             
             self.log_test_result("Schema & FAQ Analysis", passed, {
                 "score": schema_faq_analysis["score"],
-                "has_schema": schema_faq_analysis["has_schema"],
-                "has_faq": schema_faq_analysis["has_faq"],
-                "checkpoint_category": schema_faq_analysis["checkpoint_category"],
+                "has_schema": has_schema,
+                "has_faq": has_faq,
+                "checkpoint_category": category,
                 "category_label": schema_faq_analysis["category_label"],
                 "category_valid": category_valid,
                 "category_consistent": category_consistent,
@@ -287,7 +330,7 @@ class WebsiteAnalyzerTester:
             self.log_test_result("Schema & FAQ Analysis", False, str(e))
             return False
     
-    def test_ai_insights_generation(self, result_data):
+    async def test_ai_insights_generation(self, result_data):
         """Test AI insights generation from analysis results"""
         try:
             if not result_data or "ai_insights" not in result_data:
@@ -309,8 +352,7 @@ class WebsiteAnalyzerTester:
                 return False
             
             # Check recommendation structure
-            required_fields = ["title", "description", "priority", "impact"]
-            valid_recommendations = all(all(field in rec for field in required_fields) for rec in recommendations)
+            valid_recommendations = all(REQUIRED_RECOMMENDATION_FIELDS.issubset(rec.keys()) for rec in recommendations)
             
             passed = valid_recommendations
             self.log_test_result("AI Insights Generation", passed, {
@@ -324,44 +366,43 @@ class WebsiteAnalyzerTester:
             self.log_test_result("AI Insights Generation", False, str(e))
             return False
     
-    def test_pdf_export(self, session_id):
+    async def test_pdf_export(self, session_id):
         """Test PDF export functionality"""
         try:
             if not session_id:
                 self.log_test_result("PDF Export", False, "No session ID available")
                 return False
             
-            # Request PDF export
-            response = self.session.get(f"{API_BASE_URL}/export/{session_id}?format=pdf", stream=True)
-            
-            if response.status_code != 200:
-                self.log_test_result("PDF Export", False, f"Status code: {response.status_code}, Response: {response.text}")
-                return False
-            
-            # Check content type
-            content_type = response.headers.get('Content-Type', '')
-            content_disposition = response.headers.get('Content-Disposition', '')
-            
-            is_pdf = content_type == 'application/pdf'
-            has_filename = 'filename=' in content_disposition
-            
-            # Check file size (should be non-zero)
-            content_length = int(response.headers.get('Content-Length', 0))
-            has_content = content_length > 0
-            
-            if not has_content:
-                # If Content-Length header is missing, check actual content
-                content = response.content
-                has_content = len(content) > 0
+            # Request PDF export, streaming so only the first chunk of the body is ever read
+            async with self.client.stream("GET", f"/export/{session_id}?format=pdf") as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    self.log_test_result("PDF Export", False, f"Status code: {response.status_code}, Response: {response.text}")
+                    return False
+                
+                # Check content type
+                content_type = response.headers.get('Content-Type', '')
+                content_disposition = response.headers.get('Content-Disposition', '')
+                
+                is_pdf = content_type == 'application/pdf'
+                has_filename = 'filename=' in content_disposition
+                
+                # Check the body is non-empty and starts with the PDF signature
+                first_chunk = b""
+                async for first_chunk in response.aiter_bytes(chunk_size=4096):
+                    break
+                has_content = len(first_chunk) > 0
+                has_pdf_signature = first_chunk.startswith(b"%PDF-")
             
-            passed = is_pdf and has_filename and has_content
+            passed = is_pdf and has_filename and has_content and has_pdf_signature
             
             self.log_test_result("PDF Export", passed, {
                 "content_type": content_type,
                 "content_disposition": content_disposition,
                 "is_pdf": is_pdf,
                 "has_filename": has_filename,
-                "has_content": has_content
+                "has_content": has_content,
+                "has_pdf_signature": has_pdf_signature
             })
             
             return passed
@@ -369,17 +410,17 @@ class WebsiteAnalyzerTester:
             self.log_test_result("PDF Export", False, str(e))
             return False
     
-    def test_pdf_export_error_handling(self):
+    async def test_pdf_export_error_handling(self):
         """Test PDF export error handling with invalid session ID"""
         try:
             # Request PDF export with invalid session ID
-            response = self.session.get(f"{API_BASE_URL}/export/invalid-session-id?format=pdf")
+            response = await self.client.get("/export/invalid-session-id?format=pdf")
             
             # Should return 404 for invalid session ID
             invalid_session_handled = response.status_code == 404
             
             # Test with unsupported format
-            format_response = self.session.get(f"{API_BASE_URL}/export/some-session-id?format=invalid")
+            format_response = await self.client.get("/export/some-session-id?format=invalid")
             invalid_format_handled = format_response.status_code == 400
             
             passed = invalid_session_handled and invalid_format_handled
@@ -394,55 +435,87 @@ class WebsiteAnalyzerTester:
             self.log_test_result("PDF Export Error Handling", False, str(e))
             return False
     
-    def run_all_tests(self):
-        """Run all tests in sequence"""
-        logger.info("Starting backend tests for AI-Powered Website Analyzer")
-        
-        # Test root endpoint
-        self.test_root_endpoint()
-        
+    async def run_analysis_chain(self, url):
+        """Run the dependent analyze -> progress -> result tests for one URL"""
         # Test analyze endpoint with a valid URL
-        session_id = self.test_analyze_endpoint("example.com")
+        session_id = await self.test_analyze_endpoint(url)
         
         if session_id:
             # Test progress tracking
-            progress_completed = self.test_progress_endpoint(session_id)
+            progress_completed = await self.test_progress_endpoint(session_id)
             
             if progress_completed:
                 # Test result retrieval
-                result_data = self.test_result_endpoint(session_id)
+                result_data = await self.test_result_endpoint(session_id)
                 
                 if result_data:
                     # Test AI insights generation
-                    self.test_ai_insights_generation(result_data)
+                    await self.test_ai_insights_generation(result_data)
                     
                     # Test Schema & FAQ analysis
-                    self.test_schema_faq_analysis(result_data)
+                    await self.test_schema_faq_analysis(result_data)
                     
                     # Test PDF export
-                    self.test_pdf_export(session_id)
-        
-        # Test analyses endpoint
-        self.test_analyses_endpoint()
+                    await self.test_pdf_export(session_id)
+    
+    async def run_analysis_worker(self, url_queue):
+        """Run analysis chains for queued URLs until the queue is empty"""
+        while True:
+            try:
+                url = url_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await self.run_analysis_chain(url)
+    
+    async def run_analysis_chains(self, urls, max_workers):
+        """Run analysis chains for many URLs with a bounded pool of workers"""
+        url_queue = asyncio.Queue()
+        for url in urls:
+            url_queue.put_nowait(url)
         
-        # Test error handling
-        self.test_error_handling()
+        await asyncio.gather(*(self.run_analysis_worker(url_queue) for _ in range(min(len(urls), max_workers))))
+    
+    async def run_all_tests(self, urls=("example.com",), max_workers=DEFAULT_MAX_WORKERS):
+        """Run all tests, running the independent ones concurrently"""
+        logger.info("Starting backend tests for AI-Powered Website Analyzer")
         
-        # Test PDF export error handling
-        self.test_pdf_export_error_handling()
+        # Each analysis chain stays sequential inside its worker; the other tests don't depend on them
+        try:
+            await asyncio.gather(
+                self.run_analysis_chains(urls, max_workers),
+                self.test_root_endpoint(),
+                self.test_analyses_endpoint(),
+                self.test_error_handling(),
+                self.test_pdf_export_error_handling()
+            )
+        finally:
+            await self.client.aclose()
         
         # Print summary
         logger.info("\n===== TEST SUMMARY =====")
-        logger.info(f"Total tests: {self.test_results['total_tests']}")
-        logger.info(f"Passed tests: {self.test_results['passed_tests']}")
-        logger.info(f"Failed tests: {self.test_results['failed_tests']}")
+        logger.info("Total tests: %s", self.test_results['total_tests'])
+        logger.info("Passed tests: %s", self.test_results['passed_tests'])
+        logger.info("Failed tests: %s", self.test_results['failed_tests'])
         logger.info("=======================\n")
         
         return self.test_results
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backend tests for the AI-Powered Website Analyzer")
+    parser.add_argument("urls", nargs="*", help="URLs to run the analysis chain against (default: example.com)")
+    parser.add_argument("--url-file", help="File with one URL per line to add to the run")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="Number of concurrent analysis workers")
+    args = parser.parse_args()
+    
+    urls = list(args.urls)
+    if args.url_file:
+        urls.extend(line.strip() for line in Path(args.url_file).read_text().splitlines() if line.strip())
+    
     tester = WebsiteAnalyzerTester()
-    test_results = tester.run_all_tests()
+    test_results = asyncio.run(tester.run_all_tests(urls or ["example.com"], max(args.workers, 1)))
     
     # Output results as JSON
-    print(json.dumps(test_results, indent=2))
\ No newline at end of file
+    if orjson:
+        sys.stdout.buffer.write(orjson.dumps(test_results, option=orjson.OPT_INDENT_2) + b"\n")
+    else:
+        print(json.dumps(test_results, indent=2))
\ No newline at end of file
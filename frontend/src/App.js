@@ -738,7 +738,7 @@ function App() {
                   <h4 className="font-medium text-gray-900 mb-2">Content</h4>
                   <p className="text-sm text-gray-600">Words: {result.analysis_data.parsed_content.word_count}</p>
                   <p className="text-sm text-gray-600">H1 Tags: {result.analysis_data.parsed_content.headings.h1.length}</p>
-                  <p className="text-sm text-gray-600">Images: {result.analysis_data.parsed_content.images.length}</p>
+                  <p className="text-sm text-gray-600">Images: {result.analysis_data.parsed_content.images_total ?? result.analysis_data.parsed_content.images.length}</p>
                 </div>
                 <div className="bg-gray-50 p-4 rounded-lg">
                   <h4 className="font-medium text-gray-900 mb-2">Links</h4>
@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# server.py needs the LLM client at import time; skip where it is not installed
+pytest.importorskip("emergentintegrations")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+from server import analyzer  # noqa: E402
+
+
+def analyze_faq(html):
+    """Run the schema/FAQ analysis on an HTML snippet"""
+    parsed_data, tree = analyzer.parse_html_content(html, "https://example.com/")
+    return analyzer.analyze_schema_and_faq(parsed_data, tree)
+
+
+def test_hard_wrapped_paragraphs_are_not_qa_pairs():
+    html = (
+        "<p>We sell many things\nand more things\nquickly and\nalso cheaply</p>"
+        "<p>Quality\nassured and\nquite fast</p>"
+    )
+    result = analyze_faq(html)
+
+    assert result["faq_details"]["question_count"] == 1
+    assert result["faq_details"]["answer_count"] == 0
+    assert not result["has_faq"]
+    assert result["checkpoint_category"] == "neither"
+
+
+def test_qa_markers_at_node_start_are_counted():
+    html = (
+        "<div><p>Q: How does it work?</p><p>A: Like this.</p>"
+        "<p>Q2. Why?</p><p>\n  Answer: Because.</p></div>"
+    )
+    result = analyze_faq(html)
+
+    assert result["faq_details"]["question_count"] == 2
+    assert result["faq_details"]["answer_count"] == 2
+    assert result["has_faq"]
+    assert result["checkpoint_category"] == "faq_only"